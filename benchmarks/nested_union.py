@@ -78,3 +78,28 @@ def test_schema():
 
 
 print("nested union schema            ", timeit("test()", globals={"test": test_schema}, number=NUMBER))
+
+
+@schema
+class K:
+    type: str = "k"
+    a: int
+
+
+@schema
+class L:
+    type: str = "l"
+    b: float
+
+
+@schema
+class M:
+    c: Union[L, K] = Options(auto_pack=True, packer=pack_value, discriminator="type")
+
+
+def test_schema_discriminator():
+    a = {'type': 'k', 'a': 1}
+    M(c=a)
+
+
+print("nested union discriminator     ", timeit("test()", globals={"test": test_schema_discriminator}, number=NUMBER))
@@ -1,5 +1,5 @@
 from timeit import timeit
-from typing import Union
+from typing import Dict, List, Union
 
 from benchmarks.config import NUMBER
 from validate_it import schema
@@ -44,3 +44,15 @@ def test_schema():
 
 
 print("union schema            ", timeit("test()", globals={"test": test_schema}, number=NUMBER))
+
+
+@schema
+class D:
+    a: Union[int, float, str, List[int], Dict[str, int]]
+
+
+def test_schema_generic_arms():
+    D(a={"a": 1})
+
+
+print("union generic schema    ", timeit("test()", globals={"test": test_schema_generic_arms}, number=NUMBER))
@@ -0,0 +1,76 @@
+from typing import List, Optional, Union
+
+import pytest
+
+from validate_it import Options, ValidationError, adaptive_stats, pack_value, schema
+
+
+@schema(adaptive=10)
+class Measure:
+    value: Union[int, float]
+    samples: Optional[List[int]]
+
+
+@schema
+class Plain:
+    value: Union[int, float]
+
+
+@schema(adaptive=3)
+class Node:
+    value: int
+    children: List["Node"] = Options(default=list, auto_pack=True, packer=pack_value)
+
+
+def test_specialization():
+    for i in range(20):
+        Measure(value=float(i), samples=[i])
+
+    stats = adaptive_stats(Measure)
+
+    assert stats["value"]["specialized"] == "float"
+    assert stats["value"]["hits"] == 10
+    assert stats["samples"]["specialized"] == "list"
+
+    Measure(value=1, samples=None)
+    stats = adaptive_stats(Measure)
+
+    assert stats["value"]["misses"] == 1
+    assert stats["samples"]["misses"] == 1
+
+    with pytest.raises(ValidationError):
+        Measure(value=1.0, samples=["a"])
+
+    with pytest.raises(ValidationError):
+        Measure(value="1", samples=None)
+
+
+def test_despecialization():
+    @schema(adaptive=5)
+    class Switch:
+        value: Union[int, str]
+
+    for i in range(5):
+        Switch(value=i)
+
+    assert adaptive_stats(Switch)["value"]["specialized"] == "int"
+
+    for i in range(6):
+        Switch(value=str(i))
+
+    assert adaptive_stats(Switch)["value"]["specialized"] is None
+
+
+def test_not_adaptive():
+    assert adaptive_stats(Plain) == {}
+
+
+def test_forward_refs():
+    for _ in range(5):
+        node = Node(value=1, children=[Node(value=2), {"value": 3}])
+
+    assert [child.value for child in node.children] == [2, 3]
+    assert adaptive_stats(Node)["children"]["specialized"] == "list"
+
+    with pytest.raises(ValidationError):
+        Node(value=1, children=[1])
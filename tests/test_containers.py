@@ -0,0 +1,119 @@
+import pickle
+from typing import Dict, List
+
+import pytest
+
+from validate_it import Options, ValidatedDict, ValidatedList, ValidationError, from_row, pack_value, schema, to_dict
+
+
+@schema
+class Item:
+    title: str
+
+
+@schema
+class Accumulator:
+    items: List[Item] = Options(
+        default=list, auto_pack=True, packer=pack_value, validated_container=True, max_length=3
+    )
+    counters: Dict[str, int] = Options(default=dict, validated_container=True, min_length=0, max_length=2)
+    tags: List[str] = Options(default=lambda: ["x"], validated_container=True, min_length=1)
+    plain: List[int] = Options(default=list)
+
+
+def test_validated_list():
+    accumulator = Accumulator()
+
+    assert isinstance(accumulator.items, ValidatedList)
+    assert type(accumulator.plain) is list
+
+    accumulator.items.append({"title": "a"})
+    accumulator.items.extend([Item(title="b")])
+
+    assert isinstance(accumulator.items[0], Item)
+    assert to_dict(accumulator)["items"] == [{"title": "a"}, {"title": "b"}]
+
+    with pytest.raises(ValidationError):
+        accumulator.items.append({"title": 1})
+
+    with pytest.raises(ValidationError):
+        accumulator.items.extend([{"title": "c"}, {"title": "d"}])
+
+    assert len(accumulator.items) == 2
+
+    accumulator.items[0] = {"title": "c"}
+    assert accumulator.items[0].title == "c"
+
+    with pytest.raises(ValidationError):
+        accumulator.items[0:1] = [1]
+
+    accumulator.items.insert(0, {"title": "z"})
+
+    with pytest.raises(ValidationError):
+        accumulator.items += [{"title": "y"}]
+
+
+def test_min_length():
+    accumulator = Accumulator(tags=["a"])
+
+    accumulator.tags.append("b")
+    accumulator.tags.pop()
+
+    with pytest.raises(ValidationError):
+        accumulator.tags.pop()
+
+    with pytest.raises(ValidationError):
+        accumulator.tags.clear()
+
+    with pytest.raises(ValidationError):
+        del accumulator.tags[0]
+
+    assert accumulator.tags == ["a"]
+
+
+def test_validated_dict():
+    accumulator = Accumulator()
+
+    assert isinstance(accumulator.counters, ValidatedDict)
+
+    accumulator.counters["a"] = 1
+    accumulator.counters.update(b=2)
+    accumulator.counters["a"] = 3
+
+    with pytest.raises(ValidationError):
+        accumulator.counters["c"] = 1
+
+    with pytest.raises(ValidationError):
+        accumulator.counters["a"] = "x"
+
+    with pytest.raises(ValidationError):
+        accumulator.counters.update({1: 1})
+
+    assert accumulator.counters == {"a": 3, "b": 2}
+
+
+def test_reassign_and_pickle():
+    accumulator = Accumulator(items=[{"title": "a"}])
+    items = accumulator.items
+
+    accumulator.items = items
+    assert isinstance(accumulator.items, ValidatedList)
+    assert accumulator.items == items
+
+    restored = pickle.loads(pickle.dumps(accumulator))
+
+    assert isinstance(restored.items, ValidatedList)
+    assert restored.items[0].title == "a"
+
+    with pytest.raises(ValidationError):
+        restored.items.append(1)
+
+
+def test_trusted_row_is_wrapped():
+    accumulator = from_row(Accumulator, ([], {}, ["a"], []), trusted=True)
+
+    assert isinstance(accumulator.tags, ValidatedList)
+    assert isinstance(accumulator.counters, ValidatedDict)
+
+    with pytest.raises(ValidationError):
+        accumulator.tags.clear()
@@ -0,0 +1,84 @@
+import io
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+
+from validate_it import Options, ValidationError, read_csv, schema, to_dict
+from validate_it.rows import _date_from_iso, _datetime_from_iso
+
+
+@schema
+class Trade:
+    id: int
+    price: float = Options(min_value=0.0)
+    active: bool
+    created: datetime
+    comment: str = Options(alias="note")
+    quantity: Optional[int]
+    currency: str = Options(default="USD", parser=str.upper)
+
+
+_csv = """id,price,active,created,note,quantity,currency
+1,10.5,true,2020-01-01T10:00:00,first,,eur
+2,3,0,2020-01-02T10:00:00,,7,
+"""
+
+
+def test_read_csv():
+    first, second = read_csv(Trade, io.StringIO(_csv))
+
+    assert first.id == 1
+    assert first.price == 10.5
+    assert first.active is True
+    assert first.created == datetime(2020, 1, 1, 10)
+    assert first.comment == "first"
+    assert first.quantity is None
+    assert first.currency == "EUR"
+
+    assert second.price == 3.0
+    assert second.active is False
+    assert second.comment == ""
+    assert second.quantity == 7
+    assert second.currency == "USD"
+
+
+def test_read_csv_errors():
+    data = "id,price,active,created,note\n1,-1,1,2020-01-01,x\nx,1,1,2020-01-01,x\n2,1,1,2020-01-01,x\n"
+
+    with pytest.raises(ValidationError):
+        list(read_csv(Trade, io.StringIO(data)))
+
+    first, second, third = read_csv(Trade, io.StringIO(data), errors="yield")
+
+    assert isinstance(first, ValidationError)
+    assert isinstance(second, ValidationError)
+    assert to_dict(third)["id"] == 2
+
+
+def test_read_csv_is_lazy():
+    lines = read_csv(Trade, io.StringIO(_csv + "x,,,,,,\n"))
+
+    assert next(lines).id == 1
+    assert next(lines).id == 2
+
+    with pytest.raises(ValidationError):
+        next(lines)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2020-01-02T10:00", datetime(2020, 1, 2, 10, 0)),
+    ("2020-01-02 10:00:05", datetime(2020, 1, 2, 10, 0, 5)),
+    ("2020-01-02T10:00:05.123", datetime(2020, 1, 2, 10, 0, 5, 123000)),
+    ("2020-01-02T10:00:05+03:00", datetime(2020, 1, 2, 10, 0, 5, tzinfo=timezone(timedelta(hours=3)))),
+    ("2020-01-02T10:00-01:30", datetime(2020, 1, 2, 10, 0, tzinfo=timezone(-timedelta(hours=1, minutes=30)))),
+])
+def test_python36_iso_parsers(value, expected):
+    assert _datetime_from_iso(value) == expected
+    assert _date_from_iso(value[:10]) == date(2020, 1, 2)
+
+    with pytest.raises(ValueError):
+        _datetime_from_iso(value + "x")
+
+    with pytest.raises(ValueError):
+        _date_from_iso(value)
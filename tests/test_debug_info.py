@@ -2,7 +2,7 @@ from typing import Dict, List
 
 import pytest
 
-from validate_it import ValidationError, schema
+from validate_it import Options, ValidationError, ValidationErrors, pack_value, schema
 
 
 @schema
@@ -82,3 +82,56 @@ def test_debug_info():
     assert ve.value.args == (
         "Field `Multiplier#value`: <class 'float'> is not compatible with value `ang`:<class 'str'>",
     )
+
+
+@schema
+class PackedSkill:
+    level: int
+    multipliers: Dict[int, Multiplier] = Options(auto_pack=True, packer=pack_value)
+
+
+@schema(errors="collect")
+class CollectedPlayer:
+    name: str = Options(min_length=2)
+
+    items: List[Item] = Options(auto_pack=True, packer=pack_value)
+
+    skills: Dict[str, PackedSkill] = Options(auto_pack=True, packer=pack_value)
+
+    scores: List[int]
+
+
+def test_collect_errors():
+    data = dict(_data, scores=[1, "2", 3, None], name="J", items=[{"title": "Rose"}, {"title": 1}, {}])
+
+    with pytest.raises(ValidationErrors) as ve:
+        CollectedPlayer(**data)
+
+    paths = [path for path, error in ve.value.errors]
+
+    assert paths == [
+        "items[1].title",
+        "items[2].title",
+        "name",
+        "skills.fire.multipliers[2].value",
+        "skills.ice.multipliers[2].value",
+        "scores[1]",
+        "scores[3]",
+    ]
+    assert all(isinstance(error, ValidationError) for path, error in ve.value.errors)
+    assert ve.value.errors[0][1].constraint == "type"
+    assert ve.value.errors[2][1].constraint == "min_length"
+    assert str(ve.value).splitlines()[4] == (
+        "skills.ice.multipliers[2].value: "
+        "Field `Multiplier#value`: <class 'float'> is not compatible with value `ang`:<class 'str'>"
+    )
+
+
+def test_collect_unknown_and_valid():
+    with pytest.raises(ValidationErrors) as ve:
+        CollectedPlayer(name="John", items=[], skills={}, scores=[], unknown=1)
+
+    assert [path for path, error in ve.value.errors] == [""]
+
+    player = CollectedPlayer(name="John", items=[{"title": "Rose"}], skills={}, scores=[1])
+    assert player.items[0].title == "Rose"
@@ -0,0 +1,136 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from validate_it import Options, ValidationError, pack_value, representation, schema, to_dict
+from validate_it.utils import is_compatible
+
+DEPTH = 5000
+
+
+@schema
+class Node:
+    value: int
+    children: List["Node"] = Options(default=list, auto_pack=True, packer=pack_value)
+
+
+@schema
+class Link:
+    value: int
+    next: Optional["Link"] = Options(auto_pack=True, packer=pack_value)
+
+
+@schema
+class Tree:
+    name: str = Options(alias="n", rename="title")
+    branches: Dict[str, "Tree"] = Options(default=dict, auto_pack=True, packer=pack_value)
+
+
+@schema(errors="collect")
+class CNode:
+    value: int
+    children: List["CNode"] = Options(default=list, auto_pack=True, packer=pack_value)
+
+
+def _chain(depth, make):
+    data = None
+
+    for i in reversed(range(depth)):
+        data = make(i, data)
+
+    return data
+
+
+def test_deep_list():
+    data = _chain(DEPTH, lambda i, child: {"value": i, "children": [child] if child else []})
+
+    node = Node(**data)
+
+    for i in range(DEPTH - 1):
+        node = node.children[0]
+
+    assert node.value == DEPTH - 1
+
+    result = to_dict(Node(**data))
+
+    for i in range(DEPTH - 1):
+        assert result["value"] == i
+        result = result["children"][0]
+
+    assert result == {"value": DEPTH - 1, "children": []}
+
+
+def test_deep_collect():
+    data = _chain(DEPTH, lambda i, child: {"value": i, "children": [child, {"value": i}] if child else []})
+
+    node = CNode(**data)
+
+    for i in range(DEPTH - 1):
+        node = node.children[0]
+
+    assert node.value == DEPTH - 1
+
+    data = _chain(DEPTH, lambda i, child: {"value": i, "children": [child] if child else [{"value": "bad"}]})
+    data["children"].append({"value": "top"})
+
+    with pytest.raises(ValidationError) as error:
+        CNode(**data)
+
+    paths = [path for path, _ in error.value.errors]
+
+    assert paths == [".".join(["children[0]"] * DEPTH) + ".value", "children[1].value"]
+
+
+def test_deep_optional():
+    data = _chain(DEPTH, lambda i, child: {"value": i, "next": child})
+
+    link = Link(**data)
+    result = to_dict(link)
+
+    for i in range(DEPTH - 1):
+        assert result["value"] == i
+        result = result["next"]
+
+    assert result == {"value": DEPTH - 1}
+
+
+def test_deep_dict_with_aliases():
+    data = _chain(100, lambda i, child: {"n": str(i), "branches": {"left": child} if child else {}})
+
+    tree = Tree(**data)
+
+    assert tree.branches["left"].branches["left"].name == "2"
+    assert to_dict(tree)["branches"]["left"]["title"] == "1"
+
+
+def test_max_depth():
+    data = _chain(10, lambda i, child: {"value": i, "children": [child] if child else []})
+
+    pack_value(data, Node, max_depth=20)
+
+    with pytest.raises(ValidationError) as error:
+        pack_value(data, Node, max_depth=5)
+
+    assert error.value.constraint == "max_depth"
+
+    node = Node(**data)
+    to_dict(node, max_depth=20)
+
+    with pytest.raises(ValidationError):
+        to_dict(node, max_depth=5)
+
+
+def test_deep_is_compatible():
+    value = _chain(DEPTH, lambda i, child: [child] if child is not None else [1])
+
+    assert is_compatible(value, List[Any])
+    assert is_compatible({"a": [1, 2], "b": []}, Dict[str, List[int]])
+    assert not is_compatible({"a": [1, "2"]}, Dict[str, List[int]])
+
+
+def test_recursive_representation():
+    assert representation(Node)["schema"]["children"]["nested_type"][0] == {
+        "required": True,
+        "type": "validate_it.schema",
+        "ref": "Node",
+    }
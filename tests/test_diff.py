@@ -0,0 +1,59 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from validate_it import Options, ValidationError, apply_delta, diff, pack_value, schema, to_dict
+
+
+@schema
+class Owner:
+    name: str
+    phone: Optional[str] = Options(rename="tel")
+
+
+@schema
+class Task:
+    title: str
+    status: str = Options(default="new", allowed=["new", "done"], rename="state")
+    owner: Owner = Options(auto_pack=True, packer=pack_value)
+    reviewers: List[Owner] = Options(default=list, auto_pack=True, packer=pack_value)
+    labels: Dict[str, int] = Options(default=dict)
+    note: Optional[str] = None
+
+
+def test_diff():
+    old = Task(title="write", owner={"name": "John"}, reviewers=[{"name": "Alan"}], labels={"a": 1}, note="n")
+    same = Task(title="write", owner={"name": "John"}, reviewers=[{"name": "Alan"}], labels={"a": 1}, note="n")
+
+    assert diff(old, old) == {}
+    assert diff(old, same) == {}
+
+    new = Task(
+        title="write", status="done", owner={"name": "John", "phone": "123"},
+        reviewers=[{"name": "Keira"}], labels={"a": 1}
+    )
+
+    assert diff(old, new) == {
+        "state": "done",
+        "owner": {"tel": "123"},
+        "reviewers": [{"name": "Keira"}],
+        "note": None,
+    }
+
+    with pytest.raises(TypeError):
+        diff(old, old.owner)
+
+
+def test_apply_delta():
+    old = Task(title="write", owner={"name": "John"}, reviewers=[{"name": "Alan"}], note="n")
+    new = Task(title="write", status="done", owner={"name": "John", "phone": "123"})
+
+    result = apply_delta(old, diff(old, new))
+
+    assert to_dict(result) == to_dict(new)
+    assert result.owner is not old.owner
+    assert old.status == "new"
+    assert diff(result, new) == {}
+
+    with pytest.raises(ValidationError):
+        apply_delta(old, {"state": "unknown"})
@@ -0,0 +1,83 @@
+from typing import Dict, List, Union
+
+import pytest
+
+from validate_it import Options, ValidationError, pack_value, representation, schema, to_dict
+
+
+@schema
+class Click:
+    type: str = "click"
+    x: int
+    y: int
+
+
+@schema
+class Scroll:
+    type: str = Options(allowed=["scroll", "wheel"])
+    delta: int
+
+
+@schema
+class Untagged:
+    delta: int
+
+
+Event = Union[Click, Scroll]
+
+
+@schema
+class Log:
+    event: Event = Options(auto_pack=True, packer=pack_value, discriminator="type")
+    events: List[Event] = Options(default=list, auto_pack=True, packer=pack_value, discriminator="type")
+    by_name: Dict[str, Event] = Options(default=dict, auto_pack=True, packer=pack_value, discriminator="type")
+
+
+def test_discriminator():
+    log = Log(
+        event={"type": "scroll", "delta": 1},
+        events=[{"type": "click", "x": 1, "y": 2}, {"type": "wheel", "delta": 3}],
+        by_name={"a": {"type": "click", "x": 0, "y": 0}},
+    )
+
+    assert isinstance(log.event, Scroll)
+    assert [type(event) for event in log.events] == [Click, Scroll]
+    assert isinstance(log.by_name["a"], Click)
+    assert to_dict(log)["events"][1] == {"type": "wheel", "delta": 3}
+
+
+def test_discriminator_does_not_fall_through():
+    with pytest.raises(ValidationError):
+        Log(event={"type": "click", "delta": 1})
+
+
+def test_unknown_tag():
+    with pytest.raises(ValidationError) as error:
+        Log(event={"type": "drag", "x": 1, "y": 2})
+
+    assert "`drag`" in error.value.args[0]
+
+    with pytest.raises(ValidationError):
+        Log(event={"x": 1, "y": 2})
+
+
+def test_untagged_arm():
+    with pytest.raises(TypeError):
+        pack_value({"delta": 1}, Union[Click, Untagged], discriminator="type")
+
+
+def test_representation():
+    assert representation(Log)["schema"]["event"]["discriminator"] == "type"
+
+
+@schema
+class Holder:
+    log: Log = Options(auto_pack=True, packer=pack_value)
+
+
+def test_unhashable_tag():
+    for packer in (lambda value: pack_value(value, Log), lambda value: Holder(log=value)):
+        with pytest.raises(ValidationError) as error:
+            packer({"event": {"type": ["click"], "x": 1, "y": 2}})
+
+        assert error.value.constraint == "discriminator"
@@ -0,0 +1,79 @@
+from time import sleep
+
+import pytest
+
+from validate_it import Options, ValidationError, batch, schema
+
+calls = []
+
+
+def load_allowed():
+    calls.append("allowed")
+    return ["usd", "eur"]
+
+
+def load_max_value():
+    calls.append("max_value")
+    return 100
+
+
+@schema
+class Price:
+    currency: str = Options(allowed=load_allowed, cache_ttl=60)
+    amount: int = Options(max_value=load_max_value)
+
+
+def test_cache_ttl():
+    calls.clear()
+
+    for _ in range(3):
+        Price(currency="usd", amount=1)
+
+    assert calls.count("allowed") == 1
+    assert calls.count("max_value") == 3
+
+    with pytest.raises(ValidationError):
+        Price(currency="gbp", amount=1)
+
+
+def test_expired():
+    @schema
+    class ShortLived:
+        currency: str = Options(allowed=load_allowed, cache_ttl=0.01)
+
+    calls.clear()
+
+    ShortLived(currency="usd")
+    ShortLived(currency="usd")
+    sleep(0.02)
+    ShortLived(currency="usd")
+
+    assert calls == ["allowed", "allowed"]
+
+
+def test_batch():
+    calls.clear()
+
+    with batch():
+        for _ in range(3):
+            Price(currency="eur", amount=1)
+
+        with pytest.raises(ValidationError):
+            Price(currency="eur", amount=101)
+
+    assert calls.count("max_value") == 1
+
+    Price(currency="eur", amount=1)
+
+    assert calls.count("max_value") == 2
+
+
+def test_unhashable_allowed():
+    @schema
+    class Point:
+        xy: list = Options(allowed=[[0, 0], [1, 1]])
+
+    Point(xy=[1, 1])
+
+    with pytest.raises(ValidationError):
+        Point(xy=[2, 2])
@@ -0,0 +1,75 @@
+import pickle
+from typing import List
+
+import pytest
+
+from validate_it import Options, ValidationError, schema
+
+
+class Loud:
+    formatted = 0
+
+    def __str__(self):
+        Loud.formatted += 1
+        return "loud"
+
+
+@schema
+class Bag:
+    items: List[int] = Options(max_length=3)
+    tag: str = Options(default="a", allowed=["a", "b"])
+
+
+def test_plain_error():
+    assert str(ValidationError("message")) == "message"
+    assert ValidationError("message").args == ("message",)
+    assert repr(ValidationError()) == "ValidationError()"
+
+
+def test_structured_error():
+    with pytest.raises(ValidationError) as error:
+        Bag(items=[1, 2, 3, 4])
+
+    assert error.value.schema == "Bag"
+    assert error.value.key == "items"
+    assert error.value.constraint == "max_length"
+    assert error.value.expected == 3
+    assert error.value.value == [1, 2, 3, 4]
+    assert error.value.args == ("Field `Bag#items`: len(`[1, 2, 3, 4]`) is greater than required",)
+
+    with pytest.raises(ValidationError) as error:
+        Bag(items=[], tag="c")
+
+    assert error.value.constraint == "allowed"
+    assert str(error.value) == "Field `Bag#tag`: value `c` is not allowed. Allowed vs: `['a', 'b']`"
+
+
+def test_lazy_message():
+    error = ValidationError(template="`{value}`", value=Loud())
+
+    assert Loud.formatted == 0
+    assert str(error) == "`loud`"
+    assert str(error) == "`loud`"
+    assert Loud.formatted == 1
+
+
+def test_truncated_message():
+    with pytest.raises(ValidationError) as error:
+        Bag(items=list(range(50000)))
+
+    assert len(str(error.value)) < 200
+
+    with pytest.raises(ValidationError) as error:
+        Bag(items=[], tag="x" * 10000)
+
+    assert len(str(error.value)) < 300
+
+
+def test_pickle_error():
+    with pytest.raises(ValidationError) as error:
+        Bag(items=[], tag="c")
+
+    restored = pickle.loads(pickle.dumps(error.value))
+
+    assert restored.args == error.value.args
+    assert restored.key == "tag"
@@ -0,0 +1,103 @@
+import pickle
+from typing import Dict, List, Optional
+
+import pytest
+
+from validate_it import FrozenInstanceError, Options, from_row, pack_value, schema, to_dict, update
+
+
+@schema(frozen=True)
+class Owner:
+    name: str
+
+
+@schema(frozen=True)
+class Pet:
+    name: str
+    owner: Owner = Options(auto_pack=True, packer=pack_value)
+    tags: List[str] = Options(default=list)
+    extra: Dict[str, int] = Options(default=dict)
+
+
+def test_frozen():
+    pet = Pet(name="Rex", owner={"name": "John"})
+
+    with pytest.raises(FrozenInstanceError):
+        pet.name = "Max"
+
+    with pytest.raises(FrozenInstanceError):
+        del pet.name
+
+    with pytest.raises(FrozenInstanceError):
+        update(pet, name="Max")
+
+    assert pet.name == "Rex"
+
+
+def test_hash_and_eq():
+    first = Pet(name="Rex", owner={"name": "John"}, tags=["a"], extra={"a": 1})
+    second = Pet(name="Rex", owner={"name": "John"}, tags=["a"], extra={"a": 1})
+    third = Pet(name="Rex", owner={"name": "Alan"}, tags=["a"], extra={"a": 1})
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != third
+    assert len({first, second, third}) == 2
+
+    restored = pickle.loads(pickle.dumps(first))
+
+    assert restored == first
+    assert hash(restored) == hash(first)
+
+    with pytest.raises(FrozenInstanceError):
+        restored.name = "Max"
+
+
+def test_containers_are_read_only():
+    tags = ["a"]
+    pet = Pet(name="Rex", owner={"name": "John"}, tags=tags, extra={"a": 1})
+    expected = hash(pet)
+
+    tags.append("b")
+
+    with pytest.raises(FrozenInstanceError):
+        pet.tags.append("b")
+
+    with pytest.raises(FrozenInstanceError):
+        pet.extra["b"] = 2
+
+    assert pet.tags == ["a"]
+    assert hash(pet) == expected
+    assert pickle.loads(pickle.dumps(pet)).tags == ["a"]
+    assert to_dict(pet)["extra"] == {"a": 1}
+
+
+def test_trusted_row_is_read_only():
+    pet = from_row(Pet, ("Rex", Owner(name="John"), ["a"], {"a": 1}), columns=["name", "owner", "tags", "extra"], trusted=True)
+    expected = hash(pet)
+
+    with pytest.raises(FrozenInstanceError):
+        pet.tags.append("b")
+
+    assert hash(pet) == expected
+
+
+@schema(frozen=True)
+class Chain:
+    value: int
+    next: Optional["Chain"] = Options(auto_pack=True, packer=pack_value)
+    tags: List[str] = Options(default=list)
+
+
+def test_deep_hash_and_eq():
+    data = None
+
+    for index in range(3000):
+        data = {"value": index, "next": data, "tags": [str(index)]}
+
+    first = Chain(**data)
+    second = Chain(**data)
+
+    assert hash(first) == hash(second)
+    assert first == second
+    assert first != Chain(value=-1, next=first.next)
@@ -0,0 +1,74 @@
+from typing import List, Optional
+
+import pytest
+
+from validate_it import FrozenInstanceError, Options, batch, pack_value, schema, to_dict
+
+
+@schema(frozen=True, intern=True)
+class Owner:
+    name: str
+    active: bool = True
+
+
+@schema(frozen=True, intern=2)
+class Tag:
+    title: str
+
+
+@schema(frozen=True, intern=True)
+class Breed:
+    name: str
+    aliases: List[str] = Options(default=list)
+
+
+@schema
+class Pet:
+    name: str
+    owner: Optional[Owner] = Options(auto_pack=True, packer=pack_value)
+    tags: List[Tag] = Options(default=list, auto_pack=True, packer=pack_value)
+    breed: Optional[Breed] = Options(auto_pack=True, packer=pack_value)
+
+
+def test_batch_intern():
+    rows = [{"name": str(index), "owner": {"name": "John"}} for index in range(3)]
+
+    with batch():
+        pets = [Pet(**row) for row in rows]
+        other = Pet(name="x", owner={"name": "John", "active": False})
+
+    assert pets[0].owner is pets[1].owner is pets[2].owner
+    assert other.owner is not pets[0].owner
+
+    assert Pet(**rows[0]).owner is not pets[0].owner
+
+
+def test_shared_containers_are_read_only():
+    with batch():
+        first = Pet(name="a", breed={"name": "pug", "aliases": ["mops"]})
+        second = Pet(name="b", breed={"name": "pug", "aliases": ["mops"]})
+
+    assert first.breed is second.breed
+
+    with pytest.raises(FrozenInstanceError):
+        first.breed.aliases.append("carlin")
+
+    assert second.breed.aliases == ["mops"]
+
+
+def test_bounded_intern():
+    Tag.__validate_it__interned__.clear()
+
+    first = Pet(name="a", tags=[{"title": "x"}, {"title": "y"}])
+    second = Pet(name="b", tags=[{"title": "x"}, {"title": "y"}, {"title": "z"}])
+
+    assert first.tags[0] is second.tags[0]
+    assert to_dict(second)["tags"] == [{"title": "x"}, {"title": "y"}, {"title": "z"}]
+    assert Tag.__validate_it__interned__.stats() == {"hits": 2, "misses": 3, "size": 2, "maxsize": 2}
+
+
+def test_only_frozen():
+    with pytest.raises(ValueError):
+        @schema(intern=True)
+        class Mutable:
+            name: str
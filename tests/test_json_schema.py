@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Union
+
+from validate_it import Options, json_schema, pack_value, representation, schema
+from validate_it.utils import _representations
+
+
+@schema
+class Owner:
+    name: str = Options(min_length=1, max_length=20)
+    email: Optional[str] = None
+
+
+@schema
+class Pet:
+    name: str
+    kind: str = Options(allowed=["cat", "dog"], default="cat")
+    age: int = Options(min_value=0, max_value=30)
+    owner: Owner = Options(auto_pack=True, packer=pack_value)
+    sitters: List[Owner] = Options(default=list, auto_pack=True, packer=pack_value, max_length=3)
+    scores: Dict[str, float] = Options(default=dict)
+    code: Union[int, str] = 0
+
+
+@schema
+class Aliased:
+    name: str = Options(alias="title")
+    nickname: Optional[str] = Options(alias="nick")
+
+
+def test_representation_cache():
+    first = representation(Pet)
+    cached = _representations[Pet][1]
+
+    Options(max_value=1)
+
+    assert representation(Pet) == first
+    assert representation(Pet) is not first
+    assert _representations[Pet][1] is cached
+
+    first["schema"]["age"]["max value"] = 100
+
+    assert representation(Pet)["schema"]["age"]["max value"] == 30
+
+    Pet.__validate_it__options__["age"].max_value = 40
+
+    second = representation(Pet)
+
+    assert second is not first
+    assert second["schema"]["age"]["max value"] == 40
+
+    Pet.__validate_it__options__["age"].max_value = 30
+
+
+def test_json_schema():
+    result = json_schema(Pet)
+
+    assert json_schema(Pet) == result
+    assert json_schema(Pet) is not result
+    assert result["$ref"] == "#/$defs/Pet"
+    assert set(result["$defs"]) == {"Pet", "Owner"}
+
+    pet = result["$defs"]["Pet"]
+
+    assert pet["required"] == ["age", "owner", "name"]
+    assert pet["additionalProperties"] is False
+    assert pet["properties"]["kind"] == {"type": "string", "enum": ["cat", "dog"], "default": "cat"}
+    assert pet["properties"]["age"] == {"type": "integer", "minimum": 0, "maximum": 30}
+    assert pet["properties"]["owner"] == {"$ref": "#/$defs/Owner"}
+    assert pet["properties"]["sitters"] == {"type": "array", "items": {"$ref": "#/$defs/Owner"}, "maxItems": 3}
+    assert pet["properties"]["scores"] == {"type": "object", "additionalProperties": {"type": "number"}}
+    assert pet["properties"]["code"] == {"anyOf": [{"type": "integer"}, {"type": "string"}], "default": 0}
+
+    owner = result["$defs"]["Owner"]
+
+    assert owner["required"] == ["name"]
+    assert owner["properties"]["name"] == {"type": "string", "minLength": 1, "maxLength": 20}
+    assert owner["properties"]["email"] == {"anyOf": [{"type": "string"}, {"type": "null"}]}
+
+
+def test_json_schema_aliases():
+    aliased = json_schema(Aliased)["$defs"]["Aliased"]
+
+    assert set(aliased["properties"]) == {"name", "title", "nickname", "nick"}
+    assert aliased["properties"]["title"] == {"type": "string"}
+    assert aliased["required"] == []
+    assert aliased["allOf"] == [{"anyOf": [{"required": ["name"]}, {"required": ["title"]}]}]
@@ -0,0 +1,125 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from validate_it import LimitExceeded, Options, ValidationError, pack_value, representation, schema
+
+
+@schema(max_items=100, max_depth=3, max_total_nodes=500)
+class Document:
+    tags: List[str] = Options(default=list)
+    meta: Dict[str, Any] = Options(default=dict)
+
+
+@schema
+class Batch:
+    ids: List[int] = Options(max_items=3)
+    tree: Any = Options(default=None, max_depth=2, max_total_nodes=lambda: 10)
+
+
+@schema
+class Leaf:
+    value: int
+
+
+@schema(time_budget=0.0)
+class Slow:
+    leaves: List[Leaf] = Options(auto_pack=True, packer=pack_value)
+
+
+def test_schema_limits():
+    Document(tags=["a"] * 100, meta={"a": {"b": [1]}})
+
+    with pytest.raises(LimitExceeded) as error:
+        Document(tags=["a"] * 101)
+
+    assert error.value.constraint == "max_items"
+    assert isinstance(error.value, ValidationError)
+
+    with pytest.raises(LimitExceeded) as error:
+        Document(meta={"a": {"b": [[1]]}})
+
+    assert error.value.constraint == "max_depth"
+
+    with pytest.raises(LimitExceeded) as error:
+        Document(meta={str(i): list(range(50)) for i in range(20)})
+
+    assert error.value.constraint == "max_total_nodes"
+    assert str(error.value) == "Schema `Document`: input has more than `500` nodes"
+
+
+def test_field_limits():
+    Batch(ids=[1, 2, 3], tree=[[1, 2]])
+
+    with pytest.raises(LimitExceeded) as error:
+        Batch(ids=[1, 2, 3, 4])
+
+    assert error.value.key == "ids"
+    assert str(error.value) == "Field `Batch#ids`: container has more than `3` items"
+
+    batch = Batch(ids=[])
+
+    with pytest.raises(LimitExceeded):
+        batch.tree = [[[1]]]
+
+    with pytest.raises(LimitExceeded):
+        batch.tree = list(range(20))
+
+
+def test_limits_fail_before_validation():
+    with pytest.raises(LimitExceeded):
+        Batch(ids=["not int"] * 10)
+
+
+def test_time_budget():
+    with pytest.raises(LimitExceeded) as error:
+        Slow(leaves=[{"value": 1}])
+
+    assert error.value.constraint == "time_budget"
+
+
+leaves_checked = []
+
+
+def count_leaf(name, key, value, root):
+    leaves_checked.append(value)
+    return value
+
+
+@schema
+class CountedLeaf:
+    value: int = Options(validators=[count_leaf])
+
+
+@schema
+class Mid:
+    leaves: List[CountedLeaf] = Options(auto_pack=True, packer=pack_value)
+
+
+@schema(max_depth=2)
+class Parent:
+    mid: Mid = Options(auto_pack=True, packer=pack_value)
+
+
+@schema
+class Root:
+    parent: Parent = Options(auto_pack=True, packer=pack_value)
+
+
+def test_nested_schema_limits():
+    data = {"mid": {"leaves": [{"value": index} for index in range(100)]}}
+
+    with pytest.raises(LimitExceeded):
+        Parent(**data)
+
+    with pytest.raises(LimitExceeded) as error:
+        Root(parent=data)
+
+    assert error.value.constraint == "max_depth"
+    assert leaves_checked == []
+
+
+def test_representation():
+    assert representation(Batch)["schema"]["ids"]["max items"] == 3
+    assert representation(Batch)["schema"]["tree"]["max total nodes"] == "dynamic"
+    assert representation(Batch)["schema"]["tree"]["type"] == "any"
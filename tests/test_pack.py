@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional, Union
 
 import pytest
 
@@ -39,3 +39,48 @@ def test_unpack():
 
     assert {} == to_dict(OptionalAutoPackEnabled(a=None))
     assert {} == to_dict(OptionalAutoPackEnabled())
+
+
+@schema
+class Point:
+    x: int
+    y: int
+    label: str = "point"
+
+
+@schema
+class Circle:
+    center: Point = Options(auto_pack=True, packer=pack_value)
+    radius: float = Options(alias="r")
+
+
+@schema(strip_unknown=True)
+class Anything:
+    note: Optional[str]
+
+
+@schema
+class Shapes:
+    shapes: List[Union[Point, Circle, Anything]] = Options(auto_pack=True, packer=pack_value)
+
+
+def test_pack_union_by_keys(monkeypatch):
+    attempts = []
+    origin = Point.__init__
+
+    def _init(self, **kwargs):
+        attempts.append(kwargs)
+        origin(self, **kwargs)
+
+    monkeypatch.setattr(Point, "__init__", _init)
+
+    shapes = Shapes(
+        shapes=[
+            {"x": 1, "y": 2},
+            {"center": {"x": 0, "y": 0}, "r": 1.0},
+            {"note": "unknown", "side": 2},
+        ]
+    ).shapes
+
+    assert [type(shape) for shape in shapes] == [Point, Circle, Anything]
+    assert attempts == [{"x": 1, "y": 2}, {"x": 0, "y": 0}]
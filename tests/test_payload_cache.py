@@ -0,0 +1,150 @@
+import uuid
+from typing import List, Optional, Union
+
+import pytest
+
+from validate_it import Options, ValidationError, load, pack_value, payload_cache_stats, schema, to_dict
+
+calls = []
+
+
+def counted(name, key, value, root):
+    calls.append(value)
+    return value
+
+
+@schema
+class Owner:
+    name: str = Options(validators=[counted])
+
+
+@schema(payload_cache=2)
+class Message:
+    title: str = Options(max_length=5)
+    owner: Owner = Options(auto_pack=True, packer=pack_value)
+    tags: List[str] = Options(default=list)
+
+
+@schema(frozen=True, payload_cache=10)
+class Frozen:
+    title: str
+
+
+def test_accepted():
+    calls.clear()
+    payload = {"title": "hi", "owner": {"name": "John"}}
+
+    first = Message(**payload)
+    second = Message(**payload)
+
+    assert calls == ["John"]
+    assert to_dict(first) == to_dict(second) == {"title": "hi", "owner": {"name": "John"}, "tags": []}
+    assert second.owner is not first.owner
+
+    second.tags.append("x")
+
+    assert Message(**payload).tags == []
+
+
+def test_rejected():
+    payload = {"title": "too long", "owner": {"name": "John"}}
+
+    with pytest.raises(ValidationError) as first:
+        Message(**payload)
+
+    with pytest.raises(ValidationError) as second:
+        Message(**payload)
+
+    assert first.value is not second.value
+    assert type(first.value) is type(second.value)
+    assert (first.value.key, first.value.constraint) == (second.value.key, second.value.constraint) == ("title", "max_length")
+    assert str(first.value) == str(second.value)
+
+
+def test_message_id_and_stats():
+    Message.__validate_it__payload_cache__.clear()
+    calls.clear()
+
+    load(Message, {"title": "a", "owner": {"name": "John"}}, message_id=1)
+    message = load(Message, {"title": "ignored"}, message_id=1)
+
+    assert message.title == "a"
+    assert calls == ["John"]
+
+    stats = payload_cache_stats(Message)
+
+    assert (stats["hits"], stats["misses"], stats["size"], stats["hit rate"]) == (1, 1, 1, 0.5)
+    assert stats["memory"] > 0
+
+
+def test_frozen_shared():
+    first = Frozen(title="a")
+    second = Frozen(title="a")
+
+    assert first == second
+    assert first is not second
+
+
+def test_static_options_only():
+    with pytest.raises(ValueError):
+        @schema(payload_cache=10)
+        class Dynamic:
+            title: str = Options(max_length=lambda: 5)
+
+    with pytest.raises(ValueError):
+        load(Owner, {"name": "John"}, message_id=1)
+
+
+@schema
+class Limited:
+    title: str = Options(max_length=lambda: 5)
+
+
+@schema(payload_cache=10)
+class Deferred:
+    limited: Optional["DeferredLimited"]
+
+
+@schema
+class DeferredLimited:
+    title: str = Options(max_length=lambda: 5)
+
+
+def test_nested_static_options_only():
+    with pytest.raises(ValueError):
+        @schema(payload_cache=10)
+        class Nested:
+            limited: Limited = Options(auto_pack=True, packer=pack_value)
+
+    with pytest.raises(ValueError):
+        @schema(payload_cache=10)
+        class InUnion:
+            limited: Optional[Union[int, Limited]]
+
+    with pytest.raises(ValueError):
+        @schema(payload_cache=10)
+        class GeneratedDefault:
+            id: str = Options(default=lambda: uuid.uuid4().hex)
+
+    with pytest.raises(ValueError):
+        @schema(payload_cache=10)
+        class InList:
+            limited: List[List[Limited]] = Options(default=list)
+
+    with pytest.raises(ValueError):
+        Deferred(limited=None)
+
+
+def test_key_order():
+    Message.__validate_it__payload_cache__.clear()
+
+    Message(title="a", owner={"name": "John"}, tags=["x"])
+    Message(tags=["x"], owner={"name": "John"}, title="a")
+
+    stats = payload_cache_stats(Message)
+
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    Message(tags=["x", "y"], owner={"name": "John"}, title="a")
+
+    assert payload_cache_stats(Message)["misses"] == 2
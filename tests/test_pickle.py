@@ -0,0 +1,96 @@
+import gc
+import pickle
+import weakref
+from typing import List, Optional
+
+from validate_it import Options, clone, pack_value, schema, to_dict
+
+
+@schema
+class Item:
+    title: str
+
+
+@schema
+class Box:
+    name: str = Options(min_length=2)
+    size: int = 1
+    items: List[Item] = Options(auto_pack=True, packer=pack_value)
+    note: Optional[str]
+
+
+Projection = clone(Box, include=["name", "size"])
+Extended = clone(Box, add=[("_id", int, Options(default=1))])
+
+
+def test_pickle():
+    box = Box(name="box", items=[{"title": "rose"}])
+    restored = pickle.loads(pickle.dumps(box))
+
+    assert isinstance(restored, Box)
+    assert to_dict(restored) == to_dict(box)
+    assert restored.items[0].title == "rose"
+    assert restored.__validate_it__origin_data__["name"] == "box"
+
+
+def test_pickle_state_is_compact():
+    box = Box(name="box", items=[])
+
+    state = box.__getstate__()
+
+    assert isinstance(state, tuple)
+    assert sorted(map(repr, state)) == sorted(map(repr, ("box", 1, [], None)))
+    assert b"__validate_it__origin_data__" not in pickle.dumps(box)
+
+
+def test_unpickle_skips_validation(monkeypatch):
+    box = Box(name="box", items=[])
+    data = pickle.dumps(box)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("validate() must not run on unpickle")
+
+    monkeypatch.setattr("validate_it.utils.validate", _fail)
+
+    assert pickle.loads(data).name == "box"
+
+
+def test_pickle_clone():
+    projection = Projection(name="box")
+    restored = pickle.loads(pickle.dumps(projection))
+
+    assert to_dict(restored) == {"name": "box", "size": 1}
+    assert type(pickle.loads(pickle.dumps(projection))) is type(restored)
+
+    extended = Extended(name="box", items=[])
+    assert to_dict(pickle.loads(pickle.dumps(extended))) == to_dict(extended)
+
+
+def test_pickle_clones_with_different_options():
+    first = clone(Box, add=[("n", int, Options(default=1))])
+    second = clone(Box, add=[("n", int, Options(default=1, max_value=5))])
+
+    restored = pickle.loads(pickle.dumps(second(name="box", items=[])))
+
+    assert type(restored) is second
+    assert type(pickle.loads(pickle.dumps(first(name="box", items=[])))) is first
+
+
+def test_dropped_clones_are_collected():
+    refs = []
+
+    for _ in range(3):
+        cls = clone(Box, add=[("n", int, Options(default=1))])
+        to_dict(cls(name="box", items=[{"title": "a"}]))
+        refs.append(weakref.ref(cls))
+
+    data = pickle.dumps(cls(name="box", items=[]))
+    del cls
+    gc.collect()
+
+    assert [ref() for ref in refs] == [None, None, None]
+
+    restored = pickle.loads(data)
+
+    assert to_dict(restored) == {"name": "box", "size": 1, "items": [], "n": 1}
+    assert type(pickle.loads(data)) is type(restored)
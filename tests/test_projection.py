@@ -0,0 +1,53 @@
+from typing import List, Optional
+
+import pytest
+
+from validate_it import Options, ValidationError, load, pack_value, schema, to_dict
+
+
+@schema
+class Owner:
+    name: str
+    phone: Optional[str] = Options(rename="tel")
+
+
+@schema
+class Task:
+    title: str
+    owner: Owner = Options(auto_pack=True, packer=pack_value)
+    reviewers: List[Owner] = Options(default=list, auto_pack=True, packer=pack_value)
+    body: str = Options(default="", max_length=3)
+
+
+def test_to_dict_projection():
+    task = Task(title="write", owner={"name": "John", "phone": "1"}, reviewers=[{"name": "Alan", "phone": "2"}])
+
+    assert to_dict(task, include=["title", "owner.name"]) == {"title": "write", "owner": {"name": "John"}}
+    assert to_dict(task, include=["reviewers.phone", "reviewers"]) == {"reviewers": [{"name": "Alan", "tel": "2"}]}
+    assert to_dict(task, exclude=["owner", "reviewers.phone", "body"]) == {
+        "title": "write", "reviewers": [{"name": "Alan"}]
+    }
+    assert to_dict(task, exclude=[]) == to_dict(task)
+
+    with pytest.raises(ValueError):
+        to_dict(task, include=["title"], exclude=["body"])
+
+
+def test_load_fields():
+    data = {"title": "write", "owner": {"name": "John"}, "body": "too long"}
+
+    with pytest.raises(ValidationError):
+        Task(**data)
+
+    task = load(Task, data, fields=["title", "owner"])
+
+    assert task.owner.name == "John"
+    assert task.body is None
+    assert to_dict(task) == {"title": "write", "owner": {"name": "John"}}
+    assert data["body"] == "too long"
+
+    with pytest.raises(ValidationError):
+        load(Task, {"title": 1}, fields=["title"])
+
+    with pytest.raises(ValueError):
+        load(Task, data, fields=["unknown"])
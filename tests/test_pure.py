@@ -0,0 +1,71 @@
+import pytest
+
+from validate_it import Options, pure, schema
+
+calls = []
+
+
+def normalize(value):
+    calls.append(value)
+    return int(value)
+
+
+def is_positive(name, key, value, root):
+    calls.append(value)
+
+    if value <= 0:
+        raise ValueError(f"{name}#{key} is not positive")
+
+    return value
+
+
+parser = pure(normalize)
+validator = pure(is_positive, maxsize=2)
+
+
+@schema
+class Amount:
+    value: int = Options(parser=parser, validators=[validator])
+
+
+def test_pure():
+    calls.clear()
+
+    for _ in range(3):
+        assert Amount(value="1").value == 1
+
+    assert calls == ["1", 1]
+    assert parser.stats() == {"hits": 2, "misses": 1, "size": 1, "maxsize": 1024}
+    assert validator.__name__ == "is_positive"
+
+
+def test_bounded_and_errors():
+    validator.clear()
+
+    for value in (1, 2, 3, 1):
+        Amount(value=value)
+
+    assert validator.stats() == {"hits": 0, "misses": 4, "size": 2, "maxsize": 2}
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            Amount(value=-1)
+
+    assert validator.stats()["misses"] == 4
+
+
+@pure
+def labeled(name, key, value, root):
+    return f"{key}:{value}"
+
+
+@schema
+class Pair:
+    first: str = Options(validators=[labeled])
+    second: str = Options(validators=[labeled])
+
+
+def test_cached_per_field():
+    pair = Pair(first="a", second="a")
+
+    assert (pair.first, pair.second) == ("first:a", "second:a")
@@ -0,0 +1,48 @@
+import copy
+from typing import List
+
+import pytest
+
+from validate_it import Options, ValidationError, pack_value, replace, schema, to_dict
+
+
+@schema
+class Owner:
+    name: str
+
+
+@schema(frozen=True)
+class Task:
+    title: str
+    status: str = Options(default="new", allowed=["new", "done"])
+    owner: Owner = Options(auto_pack=True, packer=pack_value)
+    tags: List[str] = Options(default=list)
+
+
+def test_replace():
+    task = Task(title="write", owner={"name": "John"}, tags=["a"])
+    done = replace(task, status="done")
+
+    assert (task.status, done.status) == ("new", "done")
+    assert done.owner is task.owner
+    assert done.tags is task.tags
+    assert to_dict(done) == {"title": "write", "status": "done", "owner": {"name": "John"}, "tags": ["a"]}
+    assert hash(done) != hash(task)
+
+    with pytest.raises(ValidationError):
+        replace(task, status="unknown")
+
+    assert task.status == "new"
+
+
+def test_copy():
+    task = Task(title="write", owner={"name": "John"}, tags=["a"])
+
+    shallow = copy.copy(task)
+    deep = copy.deepcopy(task)
+
+    assert shallow == task
+    assert shallow.owner is task.owner
+    assert deep.owner is not task.owner
+    assert deep.tags is not task.tags
+    assert to_dict(deep) == to_dict(task)
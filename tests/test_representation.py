@@ -1,5 +1,9 @@
+from typing import Any, List, TypeVar
+
 from validate_it import Options, representation, schema
 
+T = TypeVar("T")
+
 
 def test_representation():
     @schema
@@ -22,3 +26,15 @@ def test_representation():
             }
         }
     }
+
+
+def test_any_representation():
+    @schema
+    class R:
+        a: Any = None
+        b: List[T] = Options(default=list)
+
+    result = representation(R)["schema"]
+
+    assert result["a"]["type"] == "any"
+    assert result["b"]["nested_type"] == [{"required": True, "type": "any"}]
@@ -0,0 +1,73 @@
+import sqlite3
+from typing import Optional
+
+import pytest
+
+from validate_it import Options, ValidationError, from_row, from_rows, schema, to_dict, to_row, to_rows
+
+
+@schema
+class User:
+    id: int
+    name: str = Options(alias="login", rename="username", min_length=2)
+    score: float = Options(default=0.0)
+    email: Optional[str]
+
+
+def test_from_row():
+    values = {"id": 1, "name": "John", "score": 2.0, "email": "j@test.com"}
+    user = from_row(User, tuple(values.values()))
+
+    assert to_dict(user) == {"id": 1, "username": "John", "score": 2.0, "email": "j@test.com"}
+
+    user = from_row(User, (1, "John"), columns=["id", "login"])
+    assert user.name == "John"
+    assert user.score == 0.0
+
+    with pytest.raises(ValidationError):
+        from_row(User, (1, "J"), columns=["id", "name"])
+
+    for row in ((1, "John", 2.0), (1, "John", 2.0, "j@test.com", "extra")):
+        with pytest.raises(ValueError):
+            from_row(User, row)
+
+
+def test_declaration_order():
+    user = User(id=1, name="John", score=2.0, email="j@test.com")
+
+    assert to_row(user) == (1, "John", 2.0, "j@test.com")
+    assert to_dict(from_row(User, to_row(user))) == to_dict(user)
+
+
+def test_from_row_trusted():
+    user = from_row(User, (1, "J"), columns=["id", "name"], trusted=True)
+
+    assert user.name == "J"
+    assert user.score == 0.0
+    assert user.email is None
+
+
+def test_to_row():
+    user = User(id=1, name="John", email="j@test.com")
+
+    assert to_row(user, columns=["id", "username", "score"]) == (1, "John", 0.0)
+    assert to_row(user, columns=["email", "name"]) == ("j@test.com", "John")
+
+    with pytest.raises(ValueError):
+        to_row(user, columns=["unknown"])
+
+
+def test_sqlite_round_trip():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("create table users (id integer, login text, score real, email text)")
+
+    users = [User(id=i, name=f"user{i}", score=float(i)) for i in range(3)]
+    connection.executemany(
+        "insert into users values (?, ?, ?, ?)",
+        to_rows(users, columns=["id", "username", "score", "email"])
+    )
+
+    cursor = connection.execute("select * from users order by id")
+    loaded = from_rows(User, cursor)
+
+    assert [to_dict(user) for user in loaded] == [to_dict(user) for user in users]
@@ -0,0 +1,76 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from validate_it import Options, ValidationError, representation, schema
+from validate_it.utils import _sample, is_compatible_sample
+
+
+@schema
+class Feed:
+    values: List[int] = Options(sample=5, max_length=1000)
+    optional: Optional[List[int]] = Options(sample=5)
+    mapping: Dict[str, int] = Options(default=dict, sample=3, sample_policy="random")
+
+
+def test_sample():
+    values = list(range(100))
+    values[1] = "not checked"
+
+    feed = Feed(values=values, optional=values, mapping={str(i): i for i in range(100)})
+    assert feed.values is values
+
+    values[0] = "first"
+
+    with pytest.raises(ValidationError):
+        Feed(values=values)
+
+    with pytest.raises(ValidationError):
+        Feed(values=list(range(1001)))
+
+    with pytest.raises(ValidationError):
+        Feed(values=(1, 2))
+
+    with pytest.raises(ValidationError):
+        Feed(values=[], optional=["a"])
+
+    assert Feed(values=[], optional=None).optional is None
+
+
+def test_even_sample_includes_last():
+    values = list(range(100))
+    values[-1] = "last"
+
+    assert not is_compatible_sample(values, List[int], 5)
+    assert is_compatible_sample(values[:-1], List[int], 5)
+
+
+def test_dict_sample():
+    mapping = {str(i): i for i in range(102)}
+    assert is_compatible_sample(mapping, Dict[str, int], 3)
+
+    mapping["101"] = "last"
+
+    assert not is_compatible_sample(mapping, Dict[str, int], 3)
+
+    assert list(_sample(iter(range(100)), 100, 3, "even")) == [0, 49, 99]
+
+
+def test_sample_size():
+    with pytest.raises(ValueError):
+        Options(sample=0)
+
+    with pytest.raises(ValueError):
+        is_compatible_sample([1, 2], List[int], 0)
+
+
+def test_random_sample():
+    values = ["a"] * 100
+
+    assert not is_compatible_sample(values, List[int], 1, policy="random")
+    assert not is_compatible_sample({str(i): "a" for i in range(100)}, Dict[str, int], 3, policy="random")
+
+
+def test_representation():
+    assert representation(Feed)["schema"]["values"]["sample"] == 5
+    assert representation(Feed)["schema"]["mapping"]["sample policy"] == "random"
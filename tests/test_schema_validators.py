@@ -0,0 +1,84 @@
+import pytest
+
+from validate_it import ValidationError, ValidationErrors, schema, update
+
+calls = []
+
+
+def end_after_start(name, instance):
+    calls.append("dates")
+
+    if instance.end < instance.start:
+        raise ValidationError(f"{name}: end is before start")
+
+
+def total_is_sum(name, instance):
+    calls.append("total")
+
+    if instance.total != instance.net + instance.tax:
+        raise ValidationError(f"{name}: total is not net + tax")
+
+
+@schema(validators=[(end_after_start, ["start", "end"]), (total_is_sum, ["net", "tax", "total"])])
+class Record:
+    start: int
+    end: int
+    net: int
+    tax: int
+    total: int
+    comment: str = ""
+
+
+@schema(errors="collect", validators=[end_after_start])
+class CollectedRecord:
+    start: int
+    end: int
+
+
+def test_run_once_after_init():
+    calls.clear()
+    Record(start=1, end=2, net=1, tax=1, total=2)
+
+    assert calls == ["dates", "total"]
+
+    with pytest.raises(ValidationError):
+        Record(start=2, end=1, net=1, tax=1, total=2)
+
+
+def test_rerun_only_for_dependencies():
+    record = Record(start=1, end=2, net=1, tax=1, total=2)
+    calls.clear()
+
+    record.comment = "text"
+    record.end = 3
+
+    assert calls == ["dates"]
+
+    with pytest.raises(ValidationError):
+        record.start = 5
+
+    assert record.start == 1
+
+    calls.clear()
+    update(record, net=2, total=3)
+
+    assert calls == ["total"]
+
+    with pytest.raises(ValidationError):
+        update(record, net=5, tax=5)
+
+    assert (record.net, record.tax, record.total) == (2, 1, 3)
+
+
+def test_collect():
+    with pytest.raises(ValidationErrors) as error:
+        CollectedRecord(start=2, end=1)
+
+    assert len(error.value.errors) == 1
+
+
+def test_unknown_dependency():
+    with pytest.raises(ValueError):
+        @schema(validators=[(end_after_start, ["unknown"])])
+        class Broken:
+            start: int
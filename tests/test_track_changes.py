@@ -0,0 +1,90 @@
+from typing import List, Optional
+
+from validate_it import Options, pack_value, schema, to_dict, update
+
+
+@schema
+class Plain:
+    name: str
+
+
+@schema(track_changes=True)
+class Owner:
+    name: str
+
+
+@schema(track_changes=True)
+class Pet:
+    name: str
+    owner: Owner = Options(auto_pack=True, packer=pack_value)
+    tags: List[str] = Options(default=list)
+    nickname: Optional[str] = Options(rename="nick")
+    plain: Optional[Plain] = Options(auto_pack=True, packer=pack_value)
+    history: List[str] = Options(default=list, validated_container=True)
+
+
+def test_cached_fields_are_reused():
+    pet = Pet(name="Rex", owner={"name": "John"}, tags=["a"])
+
+    first = to_dict(pet)
+    cache = pet.__validate_it__serialized__
+    tags = cache["tags"]
+
+    assert to_dict(pet) == first == {"name": "Rex", "owner": {"name": "John"}, "tags": ["a"], "history": []}
+
+    pet.name = "Max"
+
+    assert to_dict(pet)["name"] == "Max"
+    assert cache["tags"] is tags
+
+
+def test_nested_changes():
+    pet = Pet(name="Rex", owner={"name": "John"})
+    to_dict(pet)
+
+    pet.owner.name = "Alan"
+
+    assert to_dict(pet) == {"name": "Rex", "owner": {"name": "Alan"}, "tags": [], "history": []}
+
+    update(pet, tags=["b"], nickname="R")
+
+    assert to_dict(pet) == {"name": "Rex", "owner": {"name": "Alan"}, "tags": ["b"], "history": [], "nick": "R"}
+
+
+def test_shared_nested_instance():
+    owner = Owner(name="John")
+    first = Pet(name="a", owner=owner)
+    second = Pet(name="b", owner=owner)
+
+    to_dict(first)
+    owner.name = "Alan"
+    to_dict(second)
+
+    assert to_dict(first)["owner"] == {"name": "Alan"}
+
+
+def test_output_does_not_share_cache():
+    pet = Pet(name="Rex", owner={"name": "John"}, tags=["a"])
+
+    result = to_dict(pet)
+    result["owner"]["name"] = "changed"
+    result["tags"].append("changed")
+
+    assert to_dict(pet) == {"name": "Rex", "owner": {"name": "John"}, "tags": ["a"], "history": []}
+
+
+def test_untracked_values():
+    pet = Pet(name="Rex", owner={"name": "John"}, plain={"name": "a"})
+    to_dict(pet)
+
+    pet.plain.name = "b"
+    pet.history.append("walk")
+
+    result = to_dict(pet)
+
+    assert result["plain"] == {"name": "b"}
+    assert result["history"] == ["walk"]
+
+    pet.owner.name = "Alan"
+
+    assert to_dict(pet)["owner"] == {"name": "Alan"}
@@ -166,6 +166,11 @@ class UnionC:
     c: Union[UnionA, UnionB]
 
 
+@schema
+class UnionD:
+    d: Union[int, float, str, List[int], Dict[str, int], List[UnionA]]
+
+
 @schema
 class OptionalDictA:
     i: int
@@ -428,6 +433,17 @@ def test_union():
         UnionC(c=UnionA(a=0.1))
 
 
+def test_union_generic_arms():
+    for value in (1, True, 0.5, "s", [1, 2], [], {"a": 1}):
+        assert UnionD(d=value).d == value
+
+    assert to_dict(UnionD(d=[UnionA(a=1)])) == {"d": [{"a": 1}]}
+
+    for value in ([1, "a"], {"a": "b"}, {1: 1}, None, (1,)):
+        with pytest.raises(ValidationError):
+            UnionD(d=value)
+
+
 def test_optional_dict():
     b = OptionalDictB(
         s="s",
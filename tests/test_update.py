@@ -0,0 +1,47 @@
+import pytest
+
+from validate_it import Options, ValidationError, schema, to_dict, update
+
+
+def end_after_start(name, key, value, root):
+    if value < root["start"]:
+        raise ValidationError(f"{name}#{key}: end is before start")
+
+    return value
+
+
+@schema
+class Interval:
+    start: int = Options(alias="from")
+    end: int = Options(alias="to", validators=[end_after_start])
+    title: str = Options(default="", max_length=5)
+
+
+def test_update():
+    interval = Interval(start=1, end=2)
+    origin_data = interval.__validate_it__origin_data__
+
+    assert update(interval, **{"from": 10, "to": 20}) is interval
+    assert (interval.start, interval.end) == (10, 20)
+    assert interval.__validate_it__origin_data__ is origin_data
+    assert origin_data["start"] == 10
+
+    update(interval, title="abc")
+    assert to_dict(interval) == {"start": 10, "end": 20, "title": "abc"}
+
+
+def test_update_all_or_nothing():
+    interval = Interval(start=1, end=2)
+
+    with pytest.raises(ValidationError):
+        update(interval, start=5, title="too long")
+
+    assert (interval.start, interval.title) == (1, "")
+
+    with pytest.raises(ValidationError):
+        update(interval, start=5, end=4)
+
+    with pytest.raises(ValidationError):
+        update(interval, unknown=5)
+
+    assert interval.start == 1
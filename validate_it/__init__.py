@@ -1,14 +1,37 @@
 from .decorators import *
 from .errors import *
 from .options import Options
+from .rows import *
 from .utils import *
 
 __all__ = [
     "Options",
     "ValidationError",
+    "ValidationErrors",
+    "LimitExceeded",
+    "FrozenInstanceError",
     "schema",
     "to_dict",
     "clone",
     "representation",
     "pack_value",
+    "adaptive_stats",
+    "update",
+    "replace",
+    "diff",
+    "apply_delta",
+    "load",
+    "pure",
+    "batch",
+    "payload_cache_stats",
+    "json_schema",
+    "ValidatedList",
+    "ValidatedDict",
+    "FrozenList",
+    "FrozenDict",
+    "from_row",
+    "from_rows",
+    "to_row",
+    "to_rows",
+    "read_csv",
 ]
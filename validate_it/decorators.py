@@ -3,7 +3,21 @@ from validate_it.utils import _init_schema
 
 def schema(*args, **kwargs):
     def _wrapper(cls):
-        _init_schema(cls, strip_unknown=kwargs.get('strip_unknown', False))
+        _init_schema(
+            cls,
+            strip_unknown=kwargs.get('strip_unknown', False),
+            adaptive=kwargs.get('adaptive'),
+            errors=kwargs.get('errors', 'raise'),
+            max_items=kwargs.get('max_items'),
+            max_depth=kwargs.get('max_depth'),
+            max_total_nodes=kwargs.get('max_total_nodes'),
+            time_budget=kwargs.get('time_budget'),
+            track_changes=kwargs.get('track_changes', False),
+            frozen=kwargs.get('frozen', False),
+            validators=kwargs.get('validators'),
+            intern=kwargs.get('intern'),
+            payload_cache=kwargs.get('payload_cache')
+        )
         return cls
 
     if args:
@@ -1,2 +1,113 @@
+import reprlib
+
+_short_repr = reprlib.Repr()
+_short_repr.maxlevel = 3
+_short_repr.maxtuple = _short_repr.maxlist = _short_repr.maxarray = 20
+_short_repr.maxdict = _short_repr.maxset = _short_repr.maxfrozenset = _short_repr.maxdeque = 20
+_short_repr.maxstring = _short_repr.maxother = 200
+
+MAX_VALUE_LENGTH = 200
+
+
+def _short(value):
+    """ Bounded text of value: large strings and containers are truncated without formatting them whole """
+    if isinstance(value, str):
+        return value if len(value) <= MAX_VALUE_LENGTH else value[:MAX_VALUE_LENGTH] + "..."
+
+    if isinstance(value, (list, tuple, dict, set, frozenset)):
+        return _short_repr.repr(value)
+
+    text = str(value)
+
+    return text if len(text) <= MAX_VALUE_LENGTH else text[:MAX_VALUE_LENGTH] + "..."
+
+
 class ValidationError(Exception):
-    pass
+    """
+    Can be raised as usual exception: `ValidationError("message")`.
+
+    Errors raised by validate-it itself carry structured fields (`schema`, `key`, `constraint`, `expected`,
+    `value`) and a message `template`. The message is rendered only when `str()`, `repr()` or `args`
+    is accessed, so rejected values are never formatted if nobody reads the message.
+    """
+
+    def __init__(self, *args, template=None, schema=None, key=None, constraint=None, expected=None, value=None):
+        super().__init__(*args)
+
+        self.template = template
+        self.schema = schema
+        self.key = key
+        self.constraint = constraint
+        self.expected = expected
+        self.value = value
+
+    def _render(self):
+        return self.template.format(
+            schema=self.schema,
+            key=self.key,
+            constraint=self.constraint,
+            expected=_short(self.expected),
+            value=_short(self.value),
+            value_type=type(self.value),
+        )
+
+    def _materialize(self):
+        if self.__dict__.get("template") is not None:
+            BaseException.args.__set__(self, (self._render(),))
+            self.template = None
+
+    @property
+    def args(self):
+        self._materialize()
+        return BaseException.args.__get__(self)
+
+    @args.setter
+    def args(self, value):
+        self.__dict__["template"] = None
+        BaseException.args.__set__(self, value)
+
+    def __str__(self):
+        self._materialize()
+        return super().__str__()
+
+    def __repr__(self):
+        self._materialize()
+        return super().__repr__()
+
+
+class ValidationErrors(ValidationError):
+    """ All errors found by `@schema(errors="collect")` as `(path, error)` pairs, e.g. `("items[1].title", error)` """
+
+    def __init__(self, errors=None):
+        super().__init__(template="", constraint="collect")
+
+        self.errors = errors or []
+
+    def _render(self):
+        return "\n".join(
+            f"{path}: {error}"
+            for path, error in self.errors
+        )
+
+
+class LimitExceeded(ValidationError):
+    """ Input is too large or too deep, or validation took longer than allowed """
+
+
+class _Reported(ValidationError):
+    """ Nested errors were already added to active collector """
+
+
+try:
+    from dataclasses import FrozenInstanceError
+except ImportError:  # python 3.6
+    class FrozenInstanceError(AttributeError):
+        """ Field of `@schema(frozen=True)` instance is assigned or deleted """
+
+
+__all__ = [
+    "ValidationError",
+    "ValidationErrors",
+    "LimitExceeded",
+    "FrozenInstanceError",
+]
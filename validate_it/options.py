@@ -9,6 +9,13 @@ Amount = Union[
 
 
 class Options:
+    """
+    Options of schema field. `__version__` of options is increased on every change of its public attributes
+    or type, so caches built from options of a schema (e.g. `representation`) know when to recompute.
+    """
+
+    __version__ = 0
+
     required: bool
     default: Optional[Union[Any, Callable]]
 
@@ -32,6 +39,19 @@ class Options:
 
     parser: Optional[Callable]
 
+    discriminator: Optional[str]
+
+    max_items: Optional[Union[int, Callable]]
+    max_depth: Optional[Union[int, Callable]]
+    max_total_nodes: Optional[Union[int, Callable]]
+
+    sample: Optional[Union[int, Callable]]
+    sample_policy: str
+
+    validated_container: bool
+
+    cache_ttl: Optional[float]
+
     def __init__(
         self,
         required: bool = True,
@@ -48,7 +68,15 @@ class Options:
         rename: Optional[Union[str, Callable]] = None,
         validators: Optional[Iterable[Callable]] = None,
         parser: Optional[Callable] = None,
-        serializer: Optional[Callable] = None
+        serializer: Optional[Callable] = None,
+        discriminator: Optional[str] = None,
+        max_items: Optional[Union[int, Callable]] = None,
+        max_depth: Optional[Union[int, Callable]] = None,
+        max_total_nodes: Optional[Union[int, Callable]] = None,
+        sample: Optional[Union[int, Callable]] = None,
+        sample_policy: str = "even",
+        validated_container: bool = False,
+        cache_ttl: Optional[float] = None
     ):
 
         self.required = required
@@ -66,10 +94,39 @@ class Options:
         self.validators = validators
         self.parser = parser
         self.serializer = serializer
+        self.discriminator = discriminator
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self.max_total_nodes = max_total_nodes
 
+        if sample_policy not in ("even", "random"):
+            raise ValueError(f"Unknown sample policy `{sample_policy}`")
+
+        if sample is not None and not callable(sample) and sample < 1:
+            raise ValueError(f"Sample size must be at least 1, got {sample}")
+
+        self.sample = sample
+        self.sample_policy = sample_policy
+        self.validated_container = validated_container
+        self.cache_ttl = cache_ttl
+
+        if max_items is None and max_depth is None and max_total_nodes is None:
+            self.__limits__ = None
+        else:
+            self.__limits__ = (max_items, max_depth, max_total_nodes)
+
+        self.__allowed__ = (None, None)
+        self.__cached__ = {}
         self.__type__ = None
 
+    def __setattr__(self, name, value):
+        if not name.startswith("__"):
+            object.__setattr__(self, "__version__", self.__version__ + 1)
+
+        object.__setattr__(self, name, value)
+
     def set_type(self, t):
+        self.__version__ += 1
         self.__type__ = t
 
     def get_type(self):
@@ -0,0 +1,344 @@
+import csv
+import re
+import weakref
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional, Sequence, TextIO, Union
+
+from validate_it.errors import ValidationError
+from validate_it.utils import _set_default, _trusted, is_generic_alias, unpack_value
+
+_incoming_columns = weakref.WeakKeyDictionary()
+_outgoing_columns = weakref.WeakKeyDictionary()
+_declared_columns = weakref.WeakKeyDictionary()
+
+
+def _incoming(cls, columns):
+    """ Column name -> schema key (or None for unknown column), computed once per (schema, columns) """
+    cache = _incoming_columns.get(cls)
+
+    if cache is None:
+        cache = _incoming_columns[cls] = {}
+
+    try:
+        return cache[columns]
+    except KeyError:
+        pass
+
+    lookup = {}
+
+    for key, options in cls.__validate_it__options__.items():
+        if options.alias and not callable(options.alias):
+            lookup.setdefault(options.alias, key)
+
+    for key in cls.__validate_it__options__:
+        lookup[key] = key
+
+    mapping = cache[columns] = tuple(lookup.get(column) for column in columns)
+
+    return mapping
+
+
+def _outgoing(cls, columns):
+    """ Column name -> (schema key, options), computed once per (schema, columns) """
+    cache = _outgoing_columns.get(cls)
+
+    if cache is None:
+        cache = _outgoing_columns[cls] = {}
+
+    try:
+        return cache[columns]
+    except KeyError:
+        pass
+
+    lookup = {}
+
+    for key, options in cls.__validate_it__options__.items():
+        if options.rename and not callable(options.rename):
+            lookup.setdefault(options.rename, (key, options))
+
+    for key, options in cls.__validate_it__options__.items():
+        lookup[key] = (key, options)
+
+    mapping = []
+
+    for column in columns:
+        try:
+            mapping.append(lookup[column])
+        except KeyError:
+            raise ValueError(f"{cls}: unknown column `{column}`")
+
+    mapping = cache[columns] = tuple(mapping)
+
+    return mapping
+
+
+def _default_columns(cls):
+    """ Schema keys in declaration order (fields of base classes first), computed once per schema """
+    try:
+        return _declared_columns[cls]
+    except KeyError:
+        pass
+
+    options = cls.__validate_it__options__
+    keys = {}
+
+    for base in reversed(cls.__mro__):
+        for key in base.__dict__.get("__annotations__", {}):
+            if key in options:
+                keys[key] = None
+
+    for key in options:
+        keys[key] = None
+
+    columns = _declared_columns[cls] = tuple(keys)
+
+    return columns
+
+
+def from_row(cls, row: Sequence, columns: Optional[Sequence[str]] = None, trusted: bool = False):
+    """
+    Creates schema instance from positional row. `columns` are schema keys or aliases, by default
+    all schema keys in declaration order. Raises `ValueError` if row length differs from columns.
+
+    With `trusted=True` values are stored as is: only defaults are applied, validation is skipped.
+    """
+    columns = _default_columns(cls) if columns is None else tuple(columns)
+    mapping = _incoming(cls, columns)
+
+    if len(row) != len(columns):
+        raise ValueError(f"{cls}: row has {len(row)} cells, expected {len(columns)} columns {columns}")
+
+    if trusted:
+        data = dict.fromkeys(cls.__validate_it__options__)
+
+        for key, value in zip(mapping, row):
+            if key is not None:
+                data[key] = value
+
+        for key, options in cls.__validate_it__options__.items():
+            data[key] = _set_default(options, key, data[key])
+
+        return _trusted(cls, data)
+
+    return cls(
+        **{
+            key if key is not None else column: value
+            for key, column, value in zip(mapping, columns, row)
+        }
+    )
+
+
+def from_rows(cls, rows: Iterable[Sequence], columns: Optional[Sequence[str]] = None, trusted: bool = False) -> Iterator:
+    """
+    Lazily creates schema instances from rows. If `columns` is not set and `rows` is DB-API cursor,
+    columns are taken from `cursor.description`.
+    """
+    if columns is None:
+        description = getattr(rows, "description", None)
+
+        if description:
+            columns = [column[0] for column in description]
+
+    columns = _default_columns(cls) if columns is None else tuple(columns)
+
+    for row in rows:
+        yield from_row(cls, row, columns=columns, trusted=trusted)
+
+
+def to_row(instance, columns: Optional[Sequence[str]] = None) -> tuple:
+    """
+    Exports schema instance as positional row. `columns` are schema keys or rename aliases,
+    by default all schema keys in declaration order. Missing values are exported as `None`.
+    """
+    cls = instance.__class__
+    columns = _default_columns(cls) if columns is None else tuple(columns)
+
+    row = []
+
+    for key, options in _outgoing(cls, columns):
+        value = unpack_value(getattr(instance, key, None), options.get_type())
+
+        if value is not None and options.serializer:
+            value = options.serializer(value)
+
+        row.append(value)
+
+    return tuple(row)
+
+
+def to_rows(instances: Iterable, columns: Optional[Sequence[str]] = None) -> Iterator[tuple]:
+    """ Lazily exports schema instances as rows, suitable for `cursor.executemany()` """
+    for instance in instances:
+        yield to_row(instance, columns=columns)
+
+
+_TRUE = frozenset(("1", "true", "t", "yes", "y", "on"))
+_FALSE = frozenset(("0", "false", "f", "no", "n", "off"))
+
+
+def _parse_bool(value):
+    lowered = value.strip().lower()
+
+    if lowered in _TRUE:
+        return True
+
+    if lowered in _FALSE:
+        return False
+
+    raise ValueError(value)
+
+
+def _parse_none(value):
+    return value
+
+
+_ISO_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2})(?::(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?"
+    r"(?:([+-])(\d{2}):(\d{2})|(Z))?)?$"
+)
+
+
+def _datetime_from_iso(value):
+    """ `datetime.fromisoformat` for python 3.6: date, time (seconds and microseconds are optional), UTC offset """
+    match = _ISO_DATETIME.match(value)
+
+    if match is None:
+        raise ValueError(f"Invalid isoformat string: {value!r}")
+
+    year, month, day, hour, minute, second, fraction, sign, offset_hours, offset_minutes, utc = match.groups()
+    tzinfo = None
+
+    if sign:
+        offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+        tzinfo = timezone(-offset if sign == "-" else offset)
+    elif utc:
+        tzinfo = timezone.utc
+
+    return datetime(
+        int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0),
+        int((fraction or "0").ljust(6, "0")), tzinfo
+    )
+
+
+def _date_from_iso(value):
+    """ `date.fromisoformat` for python 3.6 """
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+_parse_datetime = getattr(datetime, "fromisoformat", _datetime_from_iso)
+_parse_date = getattr(date, "fromisoformat", _date_from_iso)
+
+
+def _cell_parser(_type):
+    """ `str` -> annotated type parser. Returns `None` if the cell must be passed as is. """
+    if _type is str:
+        return None
+
+    if _type is bool:
+        return _parse_bool
+
+    if _type in (int, float):
+        return _type
+
+    if _type is datetime:
+        return _parse_datetime
+
+    if _type is date:
+        return _parse_date
+
+    return None
+
+
+def _column_parser(cls, key):
+    """ Compiles single `str` -> value function for schema field """
+    options = cls.__validate_it__options__[key]
+    name = cls.__name__
+    _type = options.get_type()
+    optional = False
+
+    if is_generic_alias(_type, (Union,)) and type(None) in _type.__args__:
+        optional = True
+        args = [arg for arg in _type.__args__ if arg is not type(None)]
+
+        if len(args) == 1:
+            _type = args[0]
+
+    parser = options.parser or _cell_parser(_type)
+
+    if parser is None:
+        if optional or options.default is not None:
+            return lambda value: value if value != "" else None
+
+        return _parse_none
+
+    keep_empty = _type is str and options.default is None
+
+    def _parse(value):
+        if value == "" and (optional or not keep_empty):
+            return None
+
+        try:
+            return parser(value)
+        except (TypeError, ValueError):
+            raise ValidationError(
+                template="Field `{schema}#{key}`: cannot parse value `{value}` as {expected}",
+                schema=name, key=key, constraint="parser", expected=_type, value=value
+            )
+
+    return _parse
+
+
+def read_csv(cls, fp: TextIO, errors: str = "raise", **fmtparams) -> Iterator:
+    """
+    Lazily reads schema instances from CSV file. First line is header: schema keys or aliases.
+
+    Cells are parsed once by a parser compiled per column from field annotation (`int`, `float`, `bool`,
+    `datetime`, `date`) or from `Options.parser`. Empty cells become `None` (except for `str` fields
+    without default), so defaults and `Optional` work as usual.
+
+    With `errors="yield"` `ValidationError` is yielded instead of instance for invalid lines.
+    """
+    if errors not in ("raise", "yield"):
+        raise ValueError(f"Unknown errors mode `{errors}`")
+
+    reader = csv.reader(fp, **fmtparams)
+
+    try:
+        columns = tuple(next(reader))
+    except StopIteration:
+        return
+
+    mapping = _incoming(cls, columns)
+
+    parsers = tuple(
+        _column_parser(cls, key) if key is not None else _parse_none
+        for key in mapping
+    )
+    keys = tuple(
+        key if key is not None else column
+        for key, column in zip(mapping, columns)
+    )
+
+    for row in reader:
+        try:
+            yield cls(
+                **{
+                    key: parse(value)
+                    for key, parse, value in zip(keys, parsers, row)
+                }
+            )
+        except ValidationError as error:
+            if errors == "raise":
+                raise
+
+            yield error
+
+
+__all__ = [
+    "from_row",
+    "from_rows",
+    "to_row",
+    "to_rows",
+    "read_csv",
+]
@@ -1,10 +1,122 @@
+import hashlib
+import json
+import pickle
+import random
+import sys
+import threading
 import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from copy import deepcopy
+from datetime import date, datetime
+from functools import update_wrapper
 from inspect import getmembers, isclass, isroutine
-from typing import Any, Dict, List, Tuple, Type, TypeVar, Union
+from itertools import repeat
+from time import monotonic
+from typing import Any, Dict, List, Tuple, Type, TypeVar, Union, get_type_hints
 
-from validate_it.errors import ValidationError
+from validate_it.errors import FrozenInstanceError, LimitExceeded, ValidationError, ValidationErrors, _Reported
 from validate_it.options import Options
 
+try:
+    from typing import ForwardRef
+except ImportError:  # python 3.6
+    from typing import _ForwardRef as ForwardRef
+
+_state = threading.local()
+
+
+def _format_path(path):
+    result = ""
+
+    for segment in path:
+        if isinstance(segment, str):
+            result = f"{result}.{segment}" if result else segment
+        else:
+            result = f"{result}[{segment!r}]"
+
+    return result
+
+
+def _mismatches(value, box_type, path=()):
+    """ Innermost `(path, type, value)` mismatches of value, used only to report errors """
+    if is_compatible(value, box_type):
+        return
+
+    if is_generic_alias(box_type, (Union,)):
+        candidates = _union_candidates(box_type, type(value))
+
+        if len(candidates) == 1:
+            yield from _mismatches(value, candidates[0][0], path)
+            return
+
+    if is_generic_alias(box_type, (list, List)) and isinstance(value, list) and getattr(box_type, '__args__', None):
+        for index, item in enumerate(value):
+            yield from _mismatches(item, box_type.__args__[0], path + (index,))
+        return
+
+    if is_generic_alias(box_type, (dict, Dict)) and isinstance(value, dict) and getattr(box_type, '__args__', None):
+        for key, item in value.items():
+            yield from _mismatches(key, box_type.__args__[0], path + (key,))
+            yield from _mismatches(item, box_type.__args__[1], path + (key,))
+        return
+
+    yield path, box_type, value
+
+
+class _Collector:
+    """ Errors of `errors="collect"` mode with path of currently validated field or element """
+
+    def __init__(self):
+        self.errors = []
+        self.path = []
+
+    def add(self, error):
+        if isinstance(error, _Reported):
+            return
+
+        if error.constraint == "type" and error.schema is not None:
+            mismatches = list(_mismatches(error.value, error.expected))
+
+            if mismatches and mismatches[0][0]:
+                for path, expected, value in mismatches:
+                    self.errors.append(
+                        (
+                            _format_path(self.path + list(path)),
+                            ValidationError(
+                                template=error.template, schema=error.schema, key=error.key,
+                                constraint="type", expected=expected, value=value
+                            )
+                        )
+                    )
+                return
+
+        self.errors.append((_format_path(self.path), error))
+
+
+def _collect(items, pack):
+    """ Packs `(path segment, item)` pairs, adding errors to active collector instead of raising at first one """
+    collector = _state.collector
+    result = []
+    failed = False
+
+    for segment, item in items:
+        collector.path.append(segment)
+
+        try:
+            result.append(pack(item))
+        except ValidationError as error:
+            collector.add(error)
+            failed = True
+        finally:
+            collector.path.pop()
+
+    if failed:
+        raise _Reported()
+
+    return result
+
 
 def is_schema(box_type):
     return hasattr(box_type, '__validate_it__options__')
@@ -20,7 +132,66 @@ def is_generic_alias(box_type, classes):
         return False
 
 
-def _repr(_type, options):
+_union_dispatch = {}
+
+
+def _candidate(arg, value_type):
+    """ `(arg, certain)` if values of `value_type` can be compatible with `arg`, else `None` """
+    if arg is Any or isinstance(arg, TypeVar):
+        return arg, True
+
+    origin = getattr(arg, '__origin__', None)
+
+    if origin is None and isinstance(arg, type):
+        return (arg, True) if issubclass(value_type, arg) else None
+
+    if isinstance(origin, type):
+        return (arg, False) if issubclass(value_type, origin) else None
+
+    return arg, False
+
+
+def _union_candidates(box_type, value_type):
+    """
+    Union arms that can accept value of `value_type`, in declaration order, as `(arm, certain)` pairs.
+    `certain` arms accept any value of this type without further checks (plain classes, `Any`, `TypeVar`).
+
+    Computed once per (union, value type), so the common case is two dict lookups.
+    """
+    try:
+        table = _union_dispatch[id(box_type)][1]
+    except KeyError:
+        table = {}
+        _union_dispatch[id(box_type)] = (box_type, table)
+
+    try:
+        return table[value_type]
+    except KeyError:
+        pass
+
+    candidates = tuple(
+        candidate
+        for candidate in map(lambda arg: _candidate(arg, value_type), box_type.__args__)
+        if candidate is not None
+    )
+    table[value_type] = candidates
+
+    return candidates
+
+
+def _union_arm(value, box_type):
+    """ First union arm compatible with value or `None` """
+    for arg, certain in _union_candidates(box_type, type(value)):
+        if certain or is_compatible(value, arg):
+            return arg
+
+    return None
+
+
+_NO_OPTIONS = Options()
+
+
+def _repr(_type, options, seen=()):
     _dict = {
         "required": options.required,
     }
@@ -52,12 +223,34 @@ def _repr(_type, options):
     if options.rename is not None:
         _dict["rename to"] = options.rename if not callable(options.rename) else "dynamic"
 
+    if options.discriminator is not None:
+        _dict["discriminator"] = options.discriminator
+
+    if options.max_items is not None:
+        _dict["max items"] = options.max_items if not callable(options.max_items) else "dynamic"
+
+    if options.max_depth is not None:
+        _dict["max depth"] = options.max_depth if not callable(options.max_depth) else "dynamic"
+
+    if options.max_total_nodes is not None:
+        _dict["max total nodes"] = options.max_total_nodes if not callable(options.max_total_nodes) else "dynamic"
+
+    if options.sample is not None:
+        _dict["sample"] = options.sample if not callable(options.sample) else "dynamic"
+        _dict["sample policy"] = options.sample_policy
+
+    if options.validated_container:
+        _dict["validated container"] = True
+
+    if options.cache_ttl is not None:
+        _dict["cache ttl"] = options.cache_ttl
+
     if is_generic_alias(_type, (Union,)):
         _dict.update(
             {
                 "type": "union",
                 "nested_types": [
-                    _repr(arg, Options())
+                    _repr(arg, _NO_OPTIONS, seen)
                     for arg in _type.__args__
                 ]
             }
@@ -68,7 +261,7 @@ def _repr(_type, options):
             {
                 "type": "list",
                 "nested_type": [
-                    _repr(_type.__args__[0], Options())
+                    _repr(_type.__args__[0], _NO_OPTIONS, seen)
                 ]
             }
         )
@@ -77,8 +270,16 @@ def _repr(_type, options):
         _dict.update(
             {
                 "type": "dict",
-                "key_type": _repr(_type.__args__[0], Options()),
-                "value_type": _repr(_type.__args__[1], Options())
+                "key_type": _repr(_type.__args__[0], _NO_OPTIONS, seen),
+                "value_type": _repr(_type.__args__[1], _NO_OPTIONS, seen)
+            }
+        )
+
+    elif hasattr(_type, '__validate_it__options__') and _type in seen:
+        _dict.update(
+            {
+                "type": "validate_it.schema",
+                "ref": _type.__name__
             }
         )
 
@@ -86,7 +287,7 @@ def _repr(_type, options):
         _dict.update(
             {
                 "type": "validate_it.schema",
-                "schema": representation(_type)
+                "schema": representation(_type, seen)
             }
         )
 
@@ -107,408 +308,2748 @@ def _repr(_type, options):
             }
         )
 
+    elif _type is Any or isinstance(_type, TypeVar):
+        _dict["type"] = "any"
+
     else:
-        _dict["type"] = _type.__name__
+        _dict["type"] = getattr(_type, "__name__", None) or str(_type)
 
     return _dict
 
 
-def representation(cls):
-    return {
+def _schema_graph(cls):
+    """ Schema `cls` and schemas nested in types of its fields (union arms, container items), each once """
+    seen = set()
+    stack = [cls]
+
+    while stack:
+        box_type = stack.pop()
+
+        if isinstance(box_type, type) and is_schema(box_type):
+            if box_type in seen:
+                continue
+
+            seen.add(box_type)
+            _resolve_types(box_type)
+
+            yield box_type
+
+            stack.extend(options.get_type() for options in box_type.__validate_it__options__.values())
+        else:
+            stack.extend(arg for arg in getattr(box_type, "__args__", None) or () if not isinstance(arg, list))
+
+
+def _options_version(cls):
+    """ Versions of all `Options` of schema `cls` and nested schemas, changes if any of them is changed """
+    return tuple(
+        (key, options, options.__version__)
+        for box_type in _schema_graph(cls)
+        for key, options in box_type.__validate_it__options__.items()
+    )
+
+
+_representations = weakref.WeakKeyDictionary()
+
+
+def representation(cls, seen=()):
+    """
+    Description of schema fields. Top level result is cached per class until `Options` of the schema
+    or of nested schemas change, every call returns a copy.
+    """
+    _resolve_types(cls)
+
+    if not seen:
+        cached = _representations.get(cls)
+
+        if cached is not None and cached[0] == _options_version(cls):
+            return _copy_plain(cached[1])
+
+    result = {
         "schema": {
-            key: _repr(options.get_type(), options)
+            key: _repr(options.get_type(), options, seen + (cls,))
             for key, options in cls.__validate_it__options__.items()
         }
     }
 
+    if not seen:
+        _representations[cls] = (_options_version(cls), result)
+        result = _copy_plain(result)
 
-def unpack_value(value, box_type):
-    """ Cast nested values types: List[NestedClass] -> List[Dict]"""
-    if value is None:
-        return value
-
-    if box_type is dict and isinstance(value, dict):
-        return value
+    return result
 
-    if box_type is list and isinstance(value, list):
-        return value
 
-    if is_generic_alias(box_type, (Union,)):
-        for arg in box_type.__args__:
-            try:
-                return unpack_value(value, arg)
-            except ValidationError:
-                continue
+_JSON_TYPES = {
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    str: {"type": "string"},
+    bool: {"type": "boolean"},
+    type(None): {"type": "null"},
+    list: {"type": "array"},
+    dict: {"type": "object"},
+    datetime: {"type": "string", "format": "date-time"},
+    date: {"type": "string", "format": "date"},
+}
 
-    if is_generic_alias(box_type, (list, List)) and isinstance(value, list):
-        if "__args__" in box_type.__dict__ and box_type.__dict__["__args__"]:
-            subtype = box_type.__args__[0]
+_JSON_LENGTH = {
+    "string": ("minLength", "maxLength"),
+    "array": ("minItems", "maxItems"),
+    "object": ("minProperties", "maxProperties"),
+}
 
-            return [
-                unpack_value(item, subtype)
-                for item in value
-            ]
-        else:
-            return value
 
-    if is_generic_alias(box_type, (dict, Dict)) and isinstance(value, dict):
-        if "__args__" in box_type.__dict__ and box_type.__dict__["__args__"]:
-            subtype_0 = box_type.__args__[0]
-            subtype_1 = box_type.__args__[1]
+def _json_value(value):
+    """ Static JSON compatible option value or `None` """
+    if value is None or callable(value):
+        return None
 
-            return {
-                unpack_value(key, subtype_0): unpack_value(value, subtype_1)
-                for key, value in value.items()
-            }
-        else:
-            return value
+    if isinstance(value, (set, frozenset, tuple)):
+        value = list(value)
 
-    if is_schema(box_type):
-        return to_dict(value)
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return None
 
     return value
 
 
-def pack_value(value, box_type):
-    """ Cast nested values types: List[Dict] -> List[NestedClass]"""
-    if value is None:
-        return None
+def _json_type(_type, defs, names):
+    if is_generic_alias(_type, (Union,)):
+        return {"anyOf": [_json_type(arg, defs, names) for arg in _type.__args__]}
 
-    try:
-        if isinstance(value, box_type):
-            return value
-    except TypeError:
-        pass
+    args = getattr(_type, "__args__", None)
 
-    if box_type is dict and isinstance(value, dict):
-        return value
+    if is_generic_alias(_type, (list, List)) and _type is not list:
+        result = {"type": "array"}
 
-    if box_type is list and isinstance(value, list):
-        return value
+        if args and not isinstance(args[0], TypeVar):
+            result["items"] = _json_type(args[0], defs, names)
 
-    if hasattr(box_type, '__validate_it__options__') and is_compatible(value, dict):
-        result = box_type(**value)
         return result
 
-    if is_generic_alias(box_type, (Union,)):
-        for arg in box_type.__args__:
-            try:
-                return pack_value(value, arg)
-            except ValidationError:
-                continue
+    if is_generic_alias(_type, (dict, Dict)) and _type is not dict:
+        result = {"type": "object"}
 
-    if is_generic_alias(box_type, (list, List)) and isinstance(value, list):
-        subtype = box_type.__args__[0]
+        if args and not isinstance(args[1], TypeVar):
+            result["additionalProperties"] = _json_type(args[1], defs, names)
 
-        return [
-            pack_value(item, subtype)
-            for item in value
-        ]
+        return result
 
-    if is_generic_alias(box_type, (dict, Dict)) and isinstance(value, dict):
-        subtype_0 = box_type.__args__[0]
-        subtype_1 = box_type.__args__[1]
+    if is_schema(_type):
+        return {"$ref": f"#/$defs/{_json_definition(_type, defs, names)}"}
 
-        return {
-            pack_value(k, subtype_0): pack_value(v, subtype_1)
-            for k, v in value.items()
-        }
+    return dict(_JSON_TYPES.get(_type, {}))
 
-    return value
 
+def _json_kinds(schema):
+    if "anyOf" in schema:
+        return {kind for arm in schema["anyOf"] for kind in _json_kinds(arm)}
 
-def is_compatible(value, box_type):
-    try:
-        return isinstance(value, box_type)
-    except TypeError:
-        pass
+    return {schema.get("type")}
 
-    if box_type is Any:
-        return True
 
-    if isinstance(box_type, TypeVar):
-        return True
+def _json_property(options, defs, names):
+    result = _json_type(options.get_type(), defs, names)
+    kinds = _json_kinds(result)
 
-    if is_generic_alias(box_type, (Union,)) and any(
-        map(
-            lambda arg: is_compatible(value, arg),
-            box_type.__args__
-        )
-    ):
-        return True
+    for kind, (min_keyword, max_keyword) in _JSON_LENGTH.items():
+        if kind not in kinds:
+            continue
 
-    if is_generic_alias(box_type, (tuple, Tuple)) and isinstance(value, tuple):
-        if len(value) != len(box_type.__args__):
-            return False
+        for keyword, value in (
+            (min_keyword, options.min_length), (max_keyword, options.max_length),
+            (min_keyword, options.size), (max_keyword, options.size),
+        ):
+            if isinstance(value, int):
+                result[keyword] = value
 
-        return all(
-            map(
-                lambda x: is_compatible(x[0], x[1]),
-                zip(value, box_type.__args__)
-            )
-        )
+    for keyword, value in (("minimum", options.min_value), ("maximum", options.max_value)):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            result[keyword] = value
 
-    if is_generic_alias(box_type, (list, List)) and isinstance(value, list):
-        subtype = box_type.__args__[0]
+    for keyword, value in (("enum", options.allowed), ("default", options.default)):
+        value = _json_value(value)
 
-        return all(
-            map(
-                lambda x: is_compatible(x, subtype),
-                value
-            )
-        )
+        if value is not None:
+            result[keyword] = value
+
+    return result
+
+
+def _rejects_missing(options):
+    """
+    Missing value (`None`) of field is rejected: there is no default, no parser or custom packer which
+    could replace it (`pack_value` keeps `None`) and the type is not optional.
+    """
+    if options.default is not None or options.parser:
+        return False
+
+    if options.auto_pack and options.packer is not pack_value:
+        return False
+
+    return not is_compatible(None, options.get_type())
+
+
+def _json_definition(cls, defs, names):
+    """ Adds definition of schema `cls` to `defs` once, returns its name """
+    if cls in names:
+        return names[cls]
+
+    name = cls.__name__
+    index = 2
+
+    while name in defs:
+        name = f"{cls.__name__}{index}"
+        index += 1
+
+    names[cls] = name
+    defs[name] = definition = {"type": "object"}
+
+    _resolve_types(cls)
+
+    alias_mapping = hasattr(cls, "__validate_it__enable_alias_mapping__")
+    properties = definition["properties"] = {}
+    required = definition["required"] = []
+    aliased = []
+
+    for key, options in cls.__validate_it__options__.items():
+        properties[key] = _json_property(options, defs, names)
+        alias = options.alias if alias_mapping and isinstance(options.alias, str) and options.alias != key else None
+
+        if alias is not None:
+            properties[alias] = properties[key]
+
+        if _rejects_missing(options):
+            if alias is None:
+                required.append(key)
+            else:
+                aliased.append({"anyOf": [{"required": [key]}, {"required": [alias]}]})
+
+    if aliased:
+        definition["allOf"] = aliased
+
+    definition["additionalProperties"] = bool(getattr(cls, "__validate_it__strip_unknown__", False))
+
+    return name
+
+
+_json_schemas = weakref.WeakKeyDictionary()
+
+
+def json_schema(cls) -> dict:
+    """
+    JSON Schema (draft 2020-12) of incoming data, each schema class is emitted once in `$defs`.
+    Dynamic options are omitted. Cached like `representation`, every call returns a copy.
+    """
+    cached = _json_schemas.get(cls)
+
+    if cached is not None and cached[0] == _options_version(cls):
+        return _copy_plain(cached[1])
+
+    defs = {}
+    name = _json_definition(cls, defs, {})
+
+    result = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$ref": f"#/$defs/{name}",
+        "$defs": defs,
+    }
+
+    _json_schemas[cls] = (_options_version(cls), result)
+
+    return _copy_plain(result)
+
+
+_FINISH = object()
+
+
+def _has_args(box_type):
+    return "__args__" in box_type.__dict__ and bool(box_type.__dict__["__args__"])
+
+
+def _is_plain(box_type):
+    """ Values of plain types are never packed or unpacked: not a schema, union, list or dict """
+    return not is_schema(box_type) and not is_generic_alias(box_type, (Union, list, List, dict, Dict))
+
+
+def _too_deep(max_depth):
+    return LimitExceeded(
+        template="Value is nested deeper than `{expected}` levels",
+        constraint="max_depth", expected=max_depth
+    )
+
+
+def _limit_exceeded(name, key, constraint, expected, message):
+    prefix = "Field `{schema}#{key}`: " if key is not None else "Schema `{schema}`: "
+
+    return LimitExceeded(
+        template=prefix + message,
+        schema=name, key=key, constraint=constraint, expected=expected
+    )
+
+
+def _check_deadline(box_type):
+    """ Time budget of `@schema(time_budget=...)` is checked before each nested instance is created """
+    deadline = getattr(_state, "deadline", None)
+
+    if deadline is not None and monotonic() > deadline:
+        raise _limit_exceeded(box_type.__name__, None, "time_budget", None, "validation took too long")
+
+
+def _check_limits(name, key, roots, max_items=None, max_depth=None, max_total_nodes=None, deadline=None):
+    """
+    Cheap scan of raw input before any per-element validation. Counts containers items, nesting levels
+    and nodes with explicit stack, raises `LimitExceeded` as soon as one of limits is exceeded.
+    Already created schema instances are counted as single nodes.
+    """
+    if callable(max_items):
+        max_items = max_items()
+
+    if callable(max_depth):
+        max_depth = max_depth()
+
+    if callable(max_total_nodes):
+        max_total_nodes = max_total_nodes()
+
+    nodes = 0
+    stack = [(root, 0) for root in roots]
+
+    while stack:
+        value, depth = stack.pop()
+        nodes += 1
+
+        if max_total_nodes is not None and nodes > max_total_nodes:
+            raise _limit_exceeded(name, key, "max_total_nodes", max_total_nodes, "input has more than `{expected}` nodes")
+
+        if deadline is not None and not nodes & 1023 and monotonic() > deadline:
+            raise _limit_exceeded(name, key, "time_budget", None, "validation took too long")
+
+        if isinstance(value, dict):
+            items = value.values()
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            items = value
+        else:
+            continue
+
+        if max_items is not None and len(items) > max_items:
+            raise _limit_exceeded(name, key, "max_items", max_items, "container has more than `{expected}` items")
+
+        if max_depth is not None and depth >= max_depth:
+            raise _limit_exceeded(name, key, "max_depth", max_depth, "input is nested deeper than `{expected}` levels")
+
+        if isinstance(value, dict):
+            nodes += len(value)
+
+        stack.extend((item, depth + 1) for item in items)
+
+
+def _unpack(value, box_type, max_depth=None, tracked=None):
+    """
+    Cast nested values types: List[NestedClass] -> List[Dict].
+
+    Nested levels are processed with explicit stack instead of recursion, so the depth of data
+    is limited only by memory and `max_depth`. Instances of `@schema(track_changes=True)` are
+    serialized with `_tracked_dict`, their `(instance, version)` are collected to `tracked`, other
+    mutable instances add `_VOLATILE`. Without `tracked` the result never shares lists and dicts with cache.
+    """
+    result = [value]
+    stack = [(value, box_type, result, 0, 0)]
+
+    while stack:
+        task = stack.pop()
+
+        if task[0] is _FINISH:
+            _, serializer, target, name, cell = task
+            value = cell[0]
+
+            if value is not None:
+                if serializer:
+                    value = serializer(value)
+
+                target[name] = value
+
+            continue
+
+        value, box_type, target, slot, depth = task
+
+        if max_depth is not None and depth > max_depth:
+            raise _too_deep(max_depth)
+
+        if value is None or box_type is dict or box_type is list:
+            continue
+
+        if is_generic_alias(box_type, (Union,)):
+            box_type = _union_arm(value, box_type)
+
+            if box_type is None:
+                continue
+
+        if is_generic_alias(box_type, (list, List)) and isinstance(value, list):
+            if not _has_args(box_type):
+                continue
+
+            subtype = box_type.__args__[0]
+            target[slot] = out = list(value)
+
+            if not _is_plain(subtype):
+                stack.extend(
+                    (item, subtype, out, index, depth + 1)
+                    for index, item in enumerate(value)
+                )
+
+        elif is_generic_alias(box_type, (dict, Dict)) and isinstance(value, dict):
+            if not _has_args(box_type):
+                continue
+
+            subtype_0 = box_type.__args__[0]
+            subtype_1 = box_type.__args__[1]
+
+            if _is_plain(subtype_0):
+                out = dict(value)
+            else:
+                out = {
+                    _unpack(key, subtype_0, max_depth): item
+                    for key, item in value.items()
+                }
+
+            target[slot] = out
+
+            if not _is_plain(subtype_1):
+                stack.extend(
+                    (item, subtype_1, out, key, depth + 1)
+                    for key, item in zip(out, value.values())
+                )
+
+        elif is_schema(box_type):
+            if max_depth is None and getattr(value, "__validate_it__track_changes__", False):
+                out, dependencies = _tracked_dict(value)
+
+                if tracked is None:
+                    target[slot] = _copy_plain(out)
+                else:
+                    target[slot] = out
+                    tracked.append((value, value.__dict__.get("__validate_it__version__", 0)))
+                    tracked.extend(dependencies)
+
+                continue
+
+            if tracked is not None and not getattr(value, "__validate_it__frozen__", False):
+                tracked.append(_VOLATILE)
+
+            target[slot] = out = {}
+            fields = []
+
+            for key, options in value.__validate_it__options__.items():
+                if options.required and hasattr(value, key):
+                    cell = [getattr(value, key)]
+                    fields.append(
+                        (
+                            (_FINISH, options.serializer, out, _expected_name(value, key), cell),
+                            (cell[0], options.get_type(), cell, 0, depth + 1)
+                        )
+                    )
+
+            for finish, field in reversed(fields):
+                stack.append(finish)
+                stack.append(field)
+
+    return result[0]
+
+
+def _serialize(options, value, tracked=None):
+    """ Outgoing value of single field, the same as in `to_dict` """
+    value = _unpack(value, options.get_type(), None, tracked)
+
+    if value is not None and options.serializer:
+        value = options.serializer(value)
+
+    return value
+
+
+def _copy_plain(value):
+    """ Copy of lists and dicts of outgoing value, so cached values are never returned to callers """
+    if isinstance(value, dict):
+        return {key: _copy_plain(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [_copy_plain(item) for item in value]
+
+    return value
+
+
+_VOLATILE = (None, None)
+
+
+def _fresh(dependencies):
+    """
+    Tracked nested instances were not changed since their `(instance, version)` was recorded.
+    `_VOLATILE` marks values whose changes can not be observed, they are never fresh.
+    """
+    return all(
+        instance is not None and instance.__dict__.get("__validate_it__version__", 0) == version
+        for instance, version in dependencies
+    )
+
+
+def _tracked_dict(instance):
+    """
+    Serializes instance of `@schema(track_changes=True)` reusing per field cache. Each cache entry keeps
+    versions of all tracked instances nested in the field, so the field is serialized again if it was
+    assigned after the last call or any of them was changed. Fields with `validated_container` and fields
+    holding mutable instances without `track_changes` are serialized on every call. Returns
+    `(out, dependencies)`, values in `out` are shared with the cache.
+    """
+    cache = instance.__dict__.get("__validate_it__serialized__")
+
+    if cache is None:
+        cache = instance.__dict__["__validate_it__serialized__"] = {}
+
+    out = {}
+    dependencies = []
+
+    for key, options in instance.__validate_it__options__.items():
+        entry = cache.get(key)
+
+        if entry is None or not _fresh(entry[1]):
+            value = None
+            nested = []
+
+            if options.validated_container:
+                nested.append(_VOLATILE)
+
+            if options.required and hasattr(instance, key):
+                value = _serialize(options, getattr(instance, key), nested)
+
+            entry = cache[key] = (value, nested)
+
+        dependencies.extend(entry[1])
+
+        if entry[0] is not None:
+            out[_expected_name(instance, key)] = entry[0]
+
+    return out, dependencies
+
+
+def _changed(instance, keys):
+    """ Drops cached serialized values of assigned fields of tracked `instance` and increases its version """
+    if getattr(instance, "__validate_it__track_changes__", False):
+        instance.__dict__["__validate_it__version__"] = instance.__dict__.get("__validate_it__version__", 0) + 1
+
+    cache = instance.__dict__.get("__validate_it__serialized__")
+
+    if cache:
+        for key in keys:
+            cache.pop(key, None)
+
+
+def unpack_value(value, box_type):
+    """ Cast nested values types: List[NestedClass] -> List[Dict]"""
+    return _unpack(value, box_type)
+
+
+_discriminator_tables = {}
+
+
+def _tag_values(box_type, discriminator):
+    """ Tag values of schema: `allowed` values or `default` of discriminator field """
+    options = box_type.__validate_it__options__.get(discriminator)
+
+    if options is not None:
+        if options.allowed is not None and not callable(options.allowed):
+            return list(options.allowed)
+
+        if options.default is not None and not callable(options.default):
+            return [options.default]
+
+    raise TypeError(
+        f"{box_type}: discriminator field `{discriminator}` must have static `allowed` values or `default`"
+    )
+
+
+def _discriminator_table(box_type, discriminator):
+    """ Tag value -> union arm, computed once per (union, discriminator) """
+    key = (box_type, discriminator)
+
+    try:
+        return _discriminator_tables[key]
+    except KeyError:
+        pass
+
+    table = {}
+
+    for arg in box_type.__args__:
+        if is_schema(arg):
+            for tag in _tag_values(arg, discriminator):
+                table.setdefault(tag, arg)
+
+    _discriminator_tables[key] = table
+
+    return table
+
+
+_signatures = weakref.WeakKeyDictionary()
+
+
+def _signature(box_type):
+    """
+    Keys required to construct schema (as sets of key and alias), all known keys and
+    whether unknown keys are rejected. Computed once per schema.
+    """
+    try:
+        return _signatures[box_type]
+    except KeyError:
+        pass
+
+    _resolve_types(box_type)
+
+    required = []
+    known = set()
+
+    for key, options in box_type.__validate_it__options__.items():
+        names = {key}
+
+        if options.alias and not callable(options.alias):
+            names.add(options.alias)
+
+        known.update(names)
+
+        if options.default is None and not options.parser and not options.auto_pack \
+                and not is_compatible(None, options.get_type()):
+            required.append(frozenset(names))
+
+    signature = (
+        tuple(required),
+        frozenset(known),
+        not getattr(box_type, "__validate_it__strip_unknown__", False)
+    )
+    _signatures[box_type] = signature
+
+    return signature
+
+
+def _is_plausible(box_type, value):
+    """ Fast check that dict keys can construct schema: all required keys present and no unknown keys """
+    required, known, strict = _signature(box_type)
+    keys = value.keys()
+
+    if strict and not keys <= known:
+        return False
+
+    for names in required:
+        if names.isdisjoint(keys):
+            return False
+
+    return True
+
+
+def _pack_arm(value, box_type, discriminator):
+    """ The only union arm that can pack value, `None` if there are several candidates or no one """
+    if isinstance(value, dict):
+        if discriminator is not None:
+            try:
+                return _discriminator_table(box_type, discriminator).get(value.get(discriminator))
+            except TypeError:
+                return None
+
+        candidates = [
+            arg
+            for arg in box_type.__args__
+            if (_is_plausible(arg, value) if is_schema(arg) else _candidate(arg, dict) is not None)
+        ]
+    else:
+        candidates = [arg for arg, certain in _union_candidates(box_type, type(value))]
+
+    if len(candidates) == 1:
+        return candidates[0]
+
+    return None
+
+
+_packed_fields_cache = weakref.WeakKeyDictionary()
+
+
+def _packed_fields(box_type):
+    """ `(key, alias, type, discriminator)` of fields packed by `pack_value`, computed once per schema """
+    try:
+        return _packed_fields_cache[box_type]
+    except KeyError:
+        pass
+
+    _resolve_types(box_type)
+
+    alias_mapping = hasattr(box_type, "__validate_it__enable_alias_mapping__")
+
+    fields = tuple(
+        (key, options.alias if alias_mapping else None, options.get_type(), options.discriminator)
+        for key, options in box_type.__validate_it__options__.items()
+        if options.auto_pack is True and options.packer is pack_value
+    )
+
+    if not box_type.__dict__.get("__validate_it__forward_refs__"):
+        _packed_fields_cache[box_type] = fields
+
+    return fields
+
+
+def _intern_key(value):
+    """ Hashable structural key of raw input, types are kept: `{'a': 1}` and `{'a': True}` differ """
+    if isinstance(value, dict):
+        return dict, frozenset((key.__class__, key, _intern_key(item)) for key, item in value.items())
+
+    if isinstance(value, list):
+        return list, tuple(_intern_key(item) for item in value)
+
+    return value.__class__, value
+
+
+def _interned(box_type, value):
+    """
+    `(table, key)` to share instances of `@schema(frozen=True, intern=...)` created from equal dicts:
+    per `with batch():` block for `intern=True`, bounded cache for `intern=<size>`. None if not interned.
+    """
+    intern = getattr(box_type, "__validate_it__intern__", None)
+
+    if not intern:
+        return None
+
+    if intern is True:
+        scope = getattr(_state, "batch", None)
+
+        if scope is None:
+            return None
+
+        table = scope.interned.get(box_type)
+
+        if table is None:
+            table = scope.interned[box_type] = _LRU()
+    else:
+        table = box_type.__validate_it__interned__
+
+    try:
+        key = _intern_key(value)
+        hash(key)
+    except TypeError:
+        return None
+
+    return table, key
+
+
+def _build(box_type, value, max_depth=None):
+    """
+    Creates schema instance from dict.
+
+    Nested dicts of auto packed fields (`packer=pack_value`) are turned into instances first, bottom-up,
+    with explicit stack instead of recursion. So constructors of nested schemas get ready instances and
+    never go deeper, and the depth of data is limited only by memory and `max_depth`.
+    Subtrees with ambiguous union arms are left to `pack_value` of their parent.
+    Raw dict of nested schema with limits is scanned before its children are created.
+
+    With active collector (`errors="collect"`) errors of nested instances are collected with their paths,
+    the field holding failed instance gets `_Failed` with these errors and reports them in its turn,
+    so errors keep the order of fields.
+    """
+    initial = getattr(_state, "deadline", None)
+    collector = getattr(_state, "collector", None)
+    base = list(collector.path) if collector is not None else None
+
+    try:
+        return _build_stack(box_type, value, max_depth, collector, base)
+    finally:
+        _state.deadline = initial
+
+        if collector is not None:
+            collector.path[:] = base
+
+
+class _Failed:
+    """ Value of field whose nested instances failed in collect mode, keeps their errors """
+
+    __slots__ = ("errors",)
+
+    def __init__(self):
+        self.errors = []
+
+
+def _build_stack(box_type, value, max_depth, collector, base):
+    result = [value]
+    failed = []
+    stack = [(value, box_type, None, result, 0, 0, (), None)]
+
+    def fail(field, found):
+        """ Keeps collected errors of nested instance in `_Failed` of the field holding it (or of the whole build) """
+        if field is None:
+            failed.extend(found)
+            return
+
+        kwargs, name = field
+        marker = kwargs.get(name)
+
+        if not isinstance(marker, _Failed):
+            marker = kwargs[name] = _Failed()
+
+        marker.errors.extend(found)
+
+    while stack:
+        task = stack.pop()
+
+        if task[0] is _FINISH:
+            _, box_type, kwargs, target, slot, interned, outer, path, field = task
+
+            if collector is None:
+                _check_deadline(box_type)
+                target[slot] = box_type(**kwargs)
+            else:
+                errors = collector.errors
+                collector.errors = []
+                collector.path[:] = base + list(path)
+
+                try:
+                    _check_deadline(box_type)
+                    target[slot] = box_type(**kwargs)
+                except ValidationError as error:
+                    collector.add(error)
+
+                found = collector.errors
+                collector.errors = errors
+
+                if found:
+                    fail(field, found)
+                    interned = None
+
+            if interned is not None:
+                interned[0].put(interned[1], target[slot])
+
+            if outer is not _MISSING:
+                _state.deadline = outer
+
+            continue
+
+        value, box_type, discriminator, target, slot, depth, path, field = task
+
+        if max_depth is not None and depth > max_depth:
+            raise _too_deep(max_depth)
+
+        if is_generic_alias(box_type, (Union,)):
+            box_type = _pack_arm(value, box_type, discriminator)
+
+            if box_type is None:
+                continue
+
+        if isinstance(value, dict) and is_schema(box_type):
+            interned = _interned(box_type, value)
+
+            if interned is not None:
+                instance = interned[0].get(interned[1])
+
+                if instance is not _MISSING:
+                    target[slot] = instance
+                    continue
+
+            limits = box_type.__dict__.get("__validate_it__limits__")
+            outer = _MISSING
+
+            if limits is not None:
+                outer = getattr(_state, "deadline", None)
+
+                try:
+                    _state.deadline = _enter_limits(box_type, value, limits)
+                except ValidationError as error:
+                    if collector is None:
+                        raise
+
+                    errors = collector.errors
+                    collector.errors = []
+                    collector.path[:] = base + list(path)
+                    collector.add(error)
+                    fail(field, collector.errors)
+                    collector.errors = errors
+                    continue
+
+            kwargs = dict(value)
+            stack.append((_FINISH, box_type, kwargs, target, slot, interned, outer, path, field))
+
+            for key, alias, _type, _discriminator in reversed(_packed_fields(box_type)):
+                name = key if key in kwargs or alias is None else alias
+                item = kwargs.get(name)
+
+                if isinstance(item, (dict, list)):
+                    stack.append((
+                        item, _type, _discriminator, kwargs, name, depth + 1,
+                        path + (key,) if collector is not None else path, (kwargs, name)
+                    ))
+
+        elif isinstance(value, list) and is_generic_alias(box_type, (list, List)) and _has_args(box_type):
+            subtype = box_type.__args__[0]
+
+            if not _is_plain(subtype):
+                target[slot] = out = list(value)
+                stack.extend(
+                    (item, subtype, discriminator, out, index, depth + 1, path + (index,) if collector is not None else path, field)
+                    for index, item in reversed(list(enumerate(value)))
+                    if isinstance(item, (dict, list))
+                )
+
+        elif isinstance(value, dict) and is_generic_alias(box_type, (dict, Dict)) and _has_args(box_type):
+            subtype = box_type.__args__[1]
+
+            if not _is_plain(subtype):
+                target[slot] = out = dict(value)
+                stack.extend(
+                    (item, subtype, discriminator, out, key, depth + 1, path + (key,) if collector is not None else path, field)
+                    for key, item in reversed(list(value.items()))
+                    if isinstance(item, (dict, list))
+                )
+
+    if failed:
+        collector.errors.extend(failed)
+        raise _Reported()
+
+    return result[0]
+
+
+def pack_value(value, box_type, discriminator=None, max_depth=None):
+    """ Cast nested values types: List[Dict] -> List[NestedClass]"""
+    if value is None:
+        return None
+
+    try:
+        if isinstance(value, box_type):
+            return value
+    except TypeError:
+        pass
+
+    if box_type is dict and isinstance(value, dict):
+        return value
+
+    if box_type is list and isinstance(value, list):
+        return value
+
+    if hasattr(box_type, '__validate_it__options__') and is_compatible(value, dict):
+        if not _packed_fields(box_type):
+            interned = _interned(box_type, value)
+
+            if interned is not None:
+                instance = interned[0].get(interned[1])
+
+                if instance is not _MISSING:
+                    return instance
+
+            _check_deadline(box_type)
+            instance = box_type(**value)
+
+            if interned is not None:
+                interned[0].put(interned[1], instance)
+
+            return instance
+
+        return _build(box_type, value, max_depth)
+
+    if is_generic_alias(box_type, (Union,)):
+        if discriminator is not None and isinstance(value, dict):
+            table = _discriminator_table(box_type, discriminator)
+            tag = value.get(discriminator)
+
+            try:
+                arg = table[tag]
+            except (KeyError, TypeError):
+                raise ValidationError(
+                    template="Discriminator `{key}`: unknown value `{value}`, expected one of {expected}",
+                    key=discriminator, constraint="discriminator", expected=list(table), value=tag
+                )
+
+            return pack_value(value, arg, max_depth=max_depth)
+
+        check_keys = isinstance(value, dict)
+        collector = getattr(_state, "collector", None)
+
+        if collector is not None:
+            _state.collector = None
+
+        try:
+            for arg in box_type.__args__:
+                if check_keys and is_schema(arg) and not _is_plausible(arg, value):
+                    continue
+
+                try:
+                    return pack_value(value, arg, max_depth=max_depth)
+                except ValidationError:
+                    continue
+        finally:
+            if collector is not None:
+                _state.collector = collector
+
+    if is_generic_alias(box_type, (list, List)) and isinstance(value, list):
+        subtype = box_type.__args__[0]
+
+        if getattr(_state, "collector", None) is not None:
+            return _collect(enumerate(value), lambda item: pack_value(item, subtype, discriminator, max_depth))
+
+        return [
+            pack_value(item, subtype, discriminator, max_depth)
+            for item in value
+        ]
+
+    if is_generic_alias(box_type, (dict, Dict)) and isinstance(value, dict):
+        subtype_0 = box_type.__args__[0]
+        subtype_1 = box_type.__args__[1]
+
+        if getattr(_state, "collector", None) is not None:
+            return dict(
+                _collect(
+                    ((k, (k, v)) for k, v in value.items()),
+                    lambda pair: (
+                        pack_value(pair[0], subtype_0),
+                        pack_value(pair[1], subtype_1, discriminator, max_depth)
+                    )
+                )
+            )
+
+        return {
+            pack_value(k, subtype_0): pack_value(v, subtype_1, discriminator, max_depth)
+            for k, v in value.items()
+        }
+
+    return value
+
+
+def _dict_pairs(value, subtype_0, subtype_1):
+    for key, item in value.items():
+        yield key, subtype_0
+        yield item, subtype_1
+
+
+def _expand(value, box_type, stack):
+    """ Checks single level of `is_compatible`, pushes nested `(value, type)` pairs to stack """
+    if box_type is Any:
+        return True
+
+    if isinstance(box_type, TypeVar):
+        return True
+
+    if is_generic_alias(box_type, (Union,)):
+        return _union_arm(value, box_type) is not None
+
+    if is_generic_alias(box_type, (tuple, Tuple)) and isinstance(value, tuple):
+        if len(value) != len(box_type.__args__):
+            return False
+
+        stack.append(zip(value, box_type.__args__))
+        return True
+
+    if is_generic_alias(box_type, (list, List)) and isinstance(value, list):
+        stack.append(zip(value, repeat(box_type.__args__[0])))
+        return True
+
+    if is_generic_alias(box_type, (dict, Dict)) and isinstance(value, dict):
+        stack.append(_dict_pairs(value, box_type.__args__[0], box_type.__args__[1]))
+        return True
+
+    return False
+
+
+def is_compatible(value, box_type):
+    try:
+        return isinstance(value, box_type)
+    except TypeError:
+        pass
+
+    stack = []
+
+    if not _expand(value, box_type, stack):
+        return False
+
+    while stack:
+        pairs = stack[-1]
+        size = len(stack)
+
+        for value, box_type in pairs:
+            try:
+                if isinstance(value, box_type):
+                    continue
+
+                return False
+            except TypeError:
+                pass
+
+            if not _expand(value, box_type, stack):
+                return False
+
+            if len(stack) != size:
+                break
+        else:
+            stack.pop()
+
+    return True
+
+
+def _sample_indices(size, count, policy):
+    """ Sorted positions of `count` of `size` items: evenly spaced (first and last included) or random """
+    if policy == "random":
+        return sorted(random.sample(range(size), count))
+
+    if count == 1:
+        return [0]
+
+    return [index * (size - 1) // (count - 1) for index in range(count)]
+
+
+def _sample(items, size, count, policy):
+    """ Items at `_sample_indices` positions, other items of not indexable `items` are only skipped """
+    indices = _sample_indices(size, count, policy)
+
+    if isinstance(items, list):
+        return [items[index] for index in indices]
+
+    return _pick(items, indices)
+
+
+def _pick(items, indices):
+    positions = iter(indices)
+    wanted = next(positions)
+
+    for position, item in enumerate(items):
+        if position == wanted:
+            yield item
+            wanted = next(positions, None)
+
+            if wanted is None:
+                return
+
+
+def is_compatible_sample(value, box_type, count, policy="even"):
+    """
+    Like `is_compatible`, but only `count` elements of large lists and dicts are checked.
+    Container type is always checked, unions are resolved by value type.
+    """
+    if count < 1:
+        raise ValueError(f"Sample size must be at least 1, got {count}")
+
+    if is_generic_alias(box_type, (Union,)):
+        return any(
+            certain or is_compatible_sample(value, arg, count, policy)
+            for arg, certain in _union_candidates(box_type, type(value))
+        )
+
+    if is_generic_alias(box_type, (list, List)) and isinstance(value, list) and len(value) > count:
+        subtype = box_type.__args__[0]
+
+        return all(
+            is_compatible(item, subtype)
+            for item in _sample(value, len(value), count, policy)
+        )
+
+    if is_generic_alias(box_type, (dict, Dict)) and isinstance(value, dict) and len(value) > count:
+        subtype_0 = box_type.__args__[0]
+        subtype_1 = box_type.__args__[1]
+
+        return all(
+            is_compatible(key, subtype_0) and is_compatible(item, subtype_1)
+            for key, item in _sample(value.items(), len(value), count, policy)
+        )
+
+    return is_compatible(value, box_type)
+
+
+class _TypeProfile:
+    """
+    Observed value types of single schema field, used by `@schema(adaptive=...)`.
+
+    After `warmup` checks, if one type dominates, the field is specialized: values of that type are
+    checked against the matching arm only (or accepted at once for plain classes). Other values take
+    the general path. The specialization is dropped if it misses more often than it hits.
+    """
+
+    def __init__(self, box_type, warmup):
+        self.box_type = box_type
+        self.warmup = warmup
+        self._reset()
+
+    def _reset(self):
+        self.calls = 0
+        self.observed = {}
+        self.hits = 0
+        self.misses = 0
+        self.fast_type = None
+        self.fast_arm = None
+        self.certain = False
+
+    def _specialize(self):
+        dominant = max(self.observed, key=self.observed.get)
+
+        if self.observed[dominant] * 10 < self.calls * 9:
+            self._reset()
+            return
+
+        if is_generic_alias(self.box_type, (Union,)):
+            candidates = _union_candidates(self.box_type, dominant)
+        else:
+            candidates = tuple(filter(None, [_candidate(self.box_type, dominant)]))
+
+        if not candidates:
+            self._reset()
+            return
+
+        self.fast_type = dominant
+        self.fast_arm, self.certain = candidates[0]
+
+    def is_compatible(self, value):
+        value_type = type(value)
+
+        if value_type is self.fast_type and (self.certain or is_compatible(value, self.fast_arm)):
+            self.hits += 1
+            return True
+
+        if self.fast_type is not None:
+            self.misses += 1
+
+            if self.misses > self.warmup and self.misses > self.hits:
+                self._reset()
+        else:
+            self.calls += 1
+            self.observed[value_type] = self.observed.get(value_type, 0) + 1
+
+            if self.calls >= self.warmup:
+                self._specialize()
+
+        return is_compatible(value, self.box_type)
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "observed": {
+                getattr(_type, "__name__", str(_type)): count
+                for _type, count in self.observed.items()
+            },
+            "specialized": getattr(self.fast_type, "__name__", None),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def adaptive_stats(cls):
+    """ Type profiles of schema fields created with `@schema(adaptive=...)` """
+    return {
+        key: profile.stats()
+        for key, profile in getattr(cls, "__validate_it__profiles__", {}).items()
+    }
+
+
+_MISSING = object()
+
+
+class _LRU:
+    """
+    Thread safe cache of `maxsize` last used entries (unbounded if `maxsize` is None) with hit/miss counters.
+    A miss is counted when a computed value is stored, so failed computations are not counted.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """ Cached value or `_MISSING`, `key` must be hashable """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return _MISSING
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self.misses += 1
+            self._data[key] = value
+
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+class pure:
+    """
+    Marks validator `(name, key, value, root)` or parser `(value)` as pure: its result depends only
+    on `value` (and on schema and field for validators, so one wrapper can be shared by several fields).
+    Results for hashable values are kept in LRU cache of `maxsize` entries, exceptions are not cached.
+
+    Example:
+
+    email: str = Options(parser=pure(normalize_email), validators=[pure(is_email, maxsize=10000)])
+    """
+
+    def __init__(self, function, maxsize=1024):
+        update_wrapper(self, function)
+        self.function = function
+        self.maxsize = maxsize
+        self._cache = _LRU(maxsize)
+
+    def __call__(self, *args):
+        if len(args) == 1:
+            key = (type(args[0]), args[0])
+        else:
+            key = (args[0], args[1], type(args[2]), args[2])
+
+        try:
+            result = self._cache.get(key)
+        except TypeError:
+            return self.function(*args)
+
+        if result is _MISSING:
+            result = self.function(*args)
+            self._cache.put(key, result)
+
+        return result
+
+    def stats(self):
+        return self._cache.stats()
+
+    def clear(self):
+        self._cache.clear()
+
+
+def getattr_or_default(obj, key, default=None):
+    if hasattr(obj, key):
+        return getattr(obj, key)
+    else:
+        return default
+
+
+def validate(name, options: Options, key, value, root, profile=None):
+    value = _set_default(options, key, value)
+    value = _convert(options, key, value)
+    value = _check_types(name, options, key, value, profile)
+
+    value = _validate_allowed(name, options, key, value)
+    value = _validate_min_value(name, options, key, value)
+    value = _validate_max_value(name, options, key, value)
+    value = _validate_min_length(name, options, key, value)
+    value = _validate_max_length(name, options, key, value)
+    value = _validate_size(name, options, key, value)
+    value = _walk_validators(name, options, key, value, root)
+
+    return value
+
+
+def _evaluate(name, function):
+    value = function()
+
+    if name == "allowed" and value is not None and not isinstance(value, (set, frozenset)):
+        try:
+            value = frozenset(value)
+        except TypeError:
+            pass
+
+    return value
+
+
+def _resolve(options: Options, name):
+    """
+    Value of callable option `name`. It is evaluated once per `with batch():` block or once per
+    `Options(cache_ttl=...)` seconds, otherwise on every call. Cached `allowed` values are frozen.
+    """
+    function = getattr(options, name)
+    scope = getattr(_state, "batch", None)
+
+    if scope is not None:
+        key = (id(options), name)
+
+        try:
+            return scope.options[key]
+        except KeyError:
+            value = scope.options[key] = _evaluate(name, function)
+            return value
+
+    if options.cache_ttl is not None:
+        now = monotonic()
+        cached = options.__cached__.get(name)
+
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        value = _evaluate(name, function)
+        options.__cached__[name] = (now + options.cache_ttl, value)
+        return value
+
+    return function()
+
+
+class _Batch:
+    __slots__ = ("options", "interned")
+
+    def __init__(self):
+        self.options = {}
+        self.interned = {}
+
+
+@contextmanager
+def batch():
+    """
+    Callable options of all fields are evaluated once inside the block, instances of
+    `@schema(frozen=True, intern=True)` created from equal dicts are shared.
+
+    Example:
+
+    with batch():
+        users = [User(**row) for row in rows]
+    """
+    outer = getattr(_state, "batch", None)
+
+    if outer is not None:
+        yield outer
+        return
+
+    _state.batch = _Batch()
+
+    try:
+        yield _state.batch
+    finally:
+        _state.batch = None
+
+
+def _set_default(options: Options, key, value):
+    if options.default is None:
+        return value
+
+    if value is None:
+        value = options.default
+
+        if value is not None:
+            if callable(value):
+                value = value()
+    return value
+
+
+def _convert(options: Options, key, value):
+    if options.parser and not is_compatible(value, options.get_type()):
+        converted = options.parser(value)
+
+        if converted is not None:
+            value = converted
+
+    return value
+
+
+def _check_types(name, options: Options, key, value, profile=None):
+    if profile is not None:
+        compatible = profile.is_compatible(value)
+    elif options.sample is not None:
+        sample = options.sample() if callable(options.sample) else options.sample
+        compatible = is_compatible_sample(value, options.get_type(), sample, options.sample_policy)
+    else:
+        compatible = is_compatible(value, options.get_type())
+
+    if not compatible:
+        raise ValidationError(
+            template="Field `{schema}#{key}`: {expected} is not compatible with value `{value}`:{value_type}",
+            schema=name, key=key, constraint="type", expected=options.get_type(), value=value
+        )
+
+    return value
+
+
+def _validate_allowed(name, options: Options, key, value):
+    if options.allowed is None:
+        return value
+
+    allowed = options.allowed
+
+    if callable(allowed):
+        allowed = _resolve(options, "allowed")
+        members = allowed
+    else:
+        members = _members(options, allowed)
+
+    if allowed and not _contains(members, value):
+        raise ValidationError(
+            template="Field `{schema}#{key}`: value `{value}` is not allowed. Allowed vs: `{expected}`",
+            schema=name, key=key, constraint="allowed", expected=allowed, value=value
+        )
+
+    return value
+
+
+def _members(options: Options, allowed):
+    """ Static `allowed` values as frozenset, recomputed only if `options.allowed` was replaced """
+    source, members = options.__allowed__
+
+    if source is not allowed:
+        members = allowed
+
+        if not isinstance(allowed, (set, frozenset)):
+            try:
+                members = frozenset(allowed)
+            except TypeError:
+                pass
+
+        options.__allowed__ = (allowed, members)
+
+    return members
+
+
+def _contains(members, value):
+    try:
+        return value in members
+    except TypeError:
+        # unhashable value and frozenset of allowed values
+        return any(value == member for member in members)
+
+
+def _validate_min_length(name, options: Options, key, value):
+    if options.min_length is None:
+        return value
+
+    min_length = options.min_length
+
+    if callable(min_length):
+        min_length = _resolve(options, "min_length")
+
+    if min_length is not None and len(value) < min_length:
+        raise ValidationError(
+            template="Field `{schema}#{key}`: len(`{value}`) is less than required",
+            schema=name, key=key, constraint="min_length", expected=min_length, value=value
+        )
+
+    return value
+
+
+def _validate_max_length(name, options: Options, key, value):
+    if options.max_length is None:
+        return value
+
+    max_length = options.max_length
+
+    if callable(max_length):
+        max_length = _resolve(options, "max_length")
+
+    if max_length is not None and len(value) > max_length:
+        raise ValidationError(
+            template="Field `{schema}#{key}`: len(`{value}`) is greater than required",
+            schema=name, key=key, constraint="max_length", expected=max_length, value=value
+        )
+
+    return value
+
+
+def _validate_min_value(name, options: Options, key, value):
+    if options.min_value is None:
+        return value
+
+    min_value = options.min_value
+
+    if callable(min_value):
+        min_value = _resolve(options, "min_value")
+
+    if min_value is not None and value < min_value:
+        raise ValidationError(
+            template="Field `{schema}#{key}`: value `{value}` is less than required",
+            schema=name, key=key, constraint="min_value", expected=min_value, value=value
+        )
+
+    return value
+
+
+def _validate_max_value(name, options: Options, key, value):
+    if options.max_value is None:
+        return value
+
+    max_value = options.max_value
+
+    if callable(max_value):
+        max_value = _resolve(options, "max_value")
+
+    if max_value is not None and value > max_value:
+        raise ValidationError(
+            template="Field `{schema}#{key}`: value `{value}` is greater than required",
+            schema=name, key=key, constraint="max_value", expected=max_value, value=value
+        )
+
+    return value
+
+
+def _validate_size(name, options: Options, key, value):
+    if options.size is None:
+        return value
+
+    size = options.size
+
+    if callable(size):
+        size = _resolve(options, "size")
+
+    if size is not None and size != len(value):
+        raise ValidationError(
+            template="Field `{schema}#{key}`: len(`{value}`) is not equal `{expected}`",
+            schema=name, key=key, constraint="size", expected=size, value=value
+        )
+
+    return value
+
+
+def _walk_validators(name, options: Options, key, value, root):
+    if options.validators is None:
+        return value
+
+    validators = options.validators
+
+    if validators:
+        for validator in validators:
+            value = validator(name, key, value, root)
+
+    return value
+
+
+class _ContainerBinding:
+    """ Field of `ValidatedList`, `ValidatedDict`: checks single elements and length after mutation """
+
+    __slots__ = ("name", "key", "options", "types")
+
+    def __init__(self, name, key, options, types):
+        self.name = name
+        self.key = key
+        self.options = options
+        self.types = types
+
+    def item(self, value, box_type):
+        options = self.options
+        auto_pack = options.auto_pack
+
+        if callable(auto_pack):
+            auto_pack = auto_pack()
+
+        if auto_pack:
+            if options.discriminator is not None:
+                value = options.packer(value, box_type, discriminator=options.discriminator)
+            else:
+                value = options.packer(value, box_type)
+
+        if not is_compatible(value, box_type):
+            raise ValidationError(
+                template="Field `{schema}#{key}`: {expected} is not compatible with value `{value}`:{value_type}",
+                schema=self.name, key=self.key, constraint="type", expected=box_type, value=value
+            )
+
+        return value
+
+    def length(self, container, size):
+        options = self.options
+
+        for constraint, limit, failed, message in (
+            ("min_length", options.min_length, lambda limit: size < limit, "is less than required"),
+            ("max_length", options.max_length, lambda limit: size > limit, "is greater than required"),
+            ("size", options.size, lambda limit: size != limit, "is not equal `{expected}`"),
+        ):
+            if limit is None:
+                continue
+
+            if callable(limit):
+                limit = _resolve(options, constraint)
+
+            if limit is not None and failed(limit):
+                raise ValidationError(
+                    template="Field `{schema}#{key}`: len(`{value}`) " + message,
+                    schema=self.name, key=self.key, constraint=constraint, expected=limit, value=container
+                )
+
+
+class ValidatedList(list):
+    """
+    List stored in field with `Options(validated_container=True)`.
+
+    Inserted elements are packed and checked one by one, length constraints are checked before mutation,
+    so `append` costs O(1) instead of revalidation of the whole list. Field `validators` and `allowed`
+    are checked only on assignment of the whole list.
+    """
+
+    __slots__ = ("_binding",)
+
+    def __init__(self, iterable=(), binding=None):
+        super().__init__(iterable)
+        self._binding = binding
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def _item(self, value):
+        return self._binding.item(value, self._binding.types[0])
+
+    def _resize(self, size):
+        self._binding.length(self, size)
+
+    def append(self, value):
+        value = self._item(value)
+        self._resize(len(self) + 1)
+        super().append(value)
+
+    def extend(self, values):
+        values = [self._item(value) for value in values]
+        self._resize(len(self) + len(values))
+        super().extend(values)
+
+    def insert(self, index, value):
+        value = self._item(value)
+        self._resize(len(self) + 1)
+        super().insert(index, value)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __imul__(self, count):
+        self._resize(len(self) * max(count, 0))
+        return super().__imul__(count)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._item(item) for item in value]
+            self._resize(len(self) - len(range(*index.indices(len(self)))) + len(value))
+        else:
+            value = self._item(value)
+
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        removed = len(range(*index.indices(len(self)))) if isinstance(index, slice) else 1
+        self._resize(len(self) - removed)
+        super().__delitem__(index)
+
+    def pop(self, index=-1):
+        if self:
+            self._resize(len(self) - 1)
+
+        return super().pop(index)
+
+    def remove(self, value):
+        if value in self:
+            self._resize(len(self) - 1)
+
+        super().remove(value)
+
+    def clear(self):
+        self._resize(0)
+        super().clear()
+
+
+class ValidatedDict(dict):
+    """
+    Dict stored in field with `Options(validated_container=True)`.
+
+    Inserted keys and values are packed and checked one by one, length constraints are checked before
+    mutation. Field `validators` and `allowed` are checked only on assignment of the whole dict.
+    """
+
+    __slots__ = ("_binding",)
+
+    def __init__(self, mapping=(), binding=None):
+        super().__init__(mapping)
+        self._binding = binding
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def _pair(self, key, value):
+        key_type, value_type = self._binding.types
+        return self._binding.item(key, key_type), self._binding.item(value, value_type)
+
+    def _resize(self, size):
+        self._binding.length(self, size)
+
+    def __setitem__(self, key, value):
+        key, value = self._pair(key, value)
+
+        if key not in self:
+            self._resize(len(self) + 1)
+
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        pairs = [self._pair(key, value) for key, value in dict(*args, **kwargs).items()]
+        self._resize(len(self) + len({key for key, value in pairs if key not in self}))
+        super().update(pairs)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def __delitem__(self, key):
+        if key in self:
+            self._resize(len(self) - 1)
+
+        super().__delitem__(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            self._resize(len(self) - 1)
+
+        return super().pop(key, *default)
+
+    def popitem(self):
+        if self:
+            self._resize(len(self) - 1)
+
+        return super().popitem()
+
+    def clear(self):
+        self._resize(0)
+        super().clear()
+
+
+def _read_only(self, *args, **kwargs):
+    raise FrozenInstanceError(f"cannot modify {self.__class__.__name__} of frozen instance")
+
+
+class FrozenList(list):
+    """
+    List stored in field of `@schema(frozen=True)` instance, all mutating methods raise `FrozenInstanceError`
+    so the cached hash of the instance stays valid.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+
+class FrozenDict(dict):
+    """
+    Dict stored in field of `@schema(frozen=True)` instance, all mutating methods raise `FrozenInstanceError`
+    so the cached hash of the instance stays valid.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    update = setdefault = pop = popitem = clear = _read_only
+    __setitem__ = __delitem__ = __ior__ = _read_only
+
+
+def _freeze(value):
+    """ Read-only copy of lists and dicts (nested ones too) stored in field of frozen instance """
+    if isinstance(value, list) and not isinstance(value, FrozenList):
+        return FrozenList(_freeze(item) for item in value)
+
+    if isinstance(value, dict) and not isinstance(value, FrozenDict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+
+    return value
+
+
+def _validated_container(name, options, key, value):
+    """ Wraps validated list or dict value of field with `Options(validated_container=True)` """
+    if isinstance(value, (ValidatedList, ValidatedDict)):
+        binding = value._binding
+
+        if binding is not None and binding.options is options and binding.key == key:
+            return value
+
+    box_type = options.get_type()
+
+    if is_generic_alias(box_type, (Union,)):
+        box_type = _union_arm(value, box_type)
+
+    args = getattr(box_type, "__args__", None) or ()
+
+    if isinstance(value, list):
+        item_type = args[0] if len(args) == 1 and not isinstance(args[0], TypeVar) else Any
+        return ValidatedList(value, _ContainerBinding(name, key, options, (item_type,)))
+
+    if isinstance(value, dict):
+        types = tuple(args) if len(args) == 2 and not isinstance(args[0], TypeVar) else (Any, Any)
+        return ValidatedDict(value, _ContainerBinding(name, key, options, types))
+
+    return value
+
+
+def _run_validators(instance, validators, previous=None, assigned=()):
+    """
+    Runs schema validators `(name, instance)`. If one of them fails, fields `previous` values are restored
+    and `assigned` fields without previous value are removed.
+    """
+    try:
+        for function, _ in validators:
+            function(instance.__class__.__name__, instance)
+    except Exception:
+        if previous is not None:
+            for key in assigned:
+                if key not in previous:
+                    instance.__dict__.pop(key, None)
+
+            instance.__dict__.update(previous)
+
+        raise
+
+
+def _init_collecting(cls, instance, kwargs, strip_unknown, collector):
+    owner = collector is None
+
+    if owner:
+        collector = _state.collector = _Collector()
+
+    found = len(collector.errors)
+
+    try:
+        mapped, unknown_fields = _map(cls, kwargs)
+
+        try:
+            _strip_unknown(cls, unknown_fields, strip_unknown=strip_unknown)
+        except ValidationError as error:
+            collector.add(error)
+
+        instance.__validate_it__origin_data__ = mapped
+
+        for key in instance.__validate_it__options__:
+            collector.path.append(key)
+
+            try:
+                setattr(instance, key, mapped.get(key))
+            except ValidationError as error:
+                collector.add(error)
+            finally:
+                collector.path.pop()
+
+        if len(collector.errors) == found:
+            for function, _ in cls.__validate_it__validators__:
+                try:
+                    function(cls.__name__, instance)
+                except ValidationError as error:
+                    collector.add(error)
+
+        if len(collector.errors) == found and hasattr(cls, '__validate_it__post_init__'):
+            try:
+                instance.__validate_it__post_init__()
+            except ValidationError as error:
+                collector.add(error)
+    finally:
+        if owner:
+            _state.collector = None
+
+    if len(collector.errors) > found:
+        if owner:
+            raise ValidationErrors(collector.errors)
+
+        raise _Reported()
+
+
+def _enter_limits(cls, kwargs, limits):
+    """ Scans raw input of schema with `@schema(max_items=...)` limits, returns deadline of its validation """
+    max_items, max_depth, max_total_nodes, time_budget = limits
+    deadline = getattr(_state, "deadline", None)
+
+    if time_budget is not None:
+        own = monotonic() + time_budget
+
+        if deadline is None or own < deadline:
+            deadline = own
+
+    _check_limits(cls.__name__, None, kwargs.values(), max_items, max_depth, max_total_nodes, deadline)
+
+    return deadline
+
+
+def _init_limited(cls, instance, kwargs, limits, init):
+    outer = getattr(_state, "deadline", None)
+    deadline = _enter_limits(cls, kwargs, limits)
+
+    _state.deadline = deadline
+
+    try:
+        init(instance, kwargs)
+    finally:
+        _state.deadline = outer
+
+
+_CONTAINERS = (dict, list, tuple)
+
+
+def _canonical(value):
+    """ Copy of input with keys of dicts (nested ones too) in sorted order, so key order does not change its digest """
+    if isinstance(value, dict):
+        try:
+            keys = sorted(value)
+        except TypeError:
+            keys = value
+
+        return {
+            key: _canonical(value[key]) if isinstance(value[key], _CONTAINERS) else value[key]
+            for key in keys
+        }
+
+    for item in value:
+        if isinstance(item, _CONTAINERS):
+            items = [_canonical(item) if isinstance(item, _CONTAINERS) else item for item in value]
+            return items if isinstance(value, list) else tuple(items)
+
+    return value
+
+
+def _payload_key(data):
+    """ Digest of pickled canonical raw input, `None` if input can not be pickled """
+    try:
+        return hashlib.blake2b(pickle.dumps(_canonical(data), pickle.HIGHEST_PROTOCOL), digest_size=16).digest()
+    except Exception:
+        return None
+
+
+def _cacheable(error):
+    """ Errors which depend only on input: not reported to collector and not timeouts """
+    if isinstance(error, _Reported) or getattr(error, "constraint", None) == "time_budget":
+        return False
+
+    return all(_cacheable(nested) for _, nested in getattr(error, "errors", ()))
+
+
+class _CachedError:
+    """ Class, args and fields of error of rejected input, a new exception is created on every cache hit """
+
+    __slots__ = ("cls", "args", "fields")
+
+    def __init__(self, error):
+        self.cls = error.__class__
+        self.args = BaseException.args.__get__(error)
+        self.fields = dict(error.__dict__)
+
+    def create(self):
+        error = self.cls.__new__(self.cls, *self.args)
+        error.__dict__.update({
+            name: list(value) if isinstance(value, list) else value
+            for name, value in self.fields.items()
+        })
+        return error
+
+
+def _init_cached(instance, kwargs, cache, key, init):
+    """
+    Instance of `@schema(payload_cache=...)`: field values of accepted input are restored without validation,
+    error of rejected input is raised again as a new exception.
+
+    Frozen instances are immutable and their field values are shared. Other instances are stored pickled and
+    every hit unpickles an independent copy: faster than `deepcopy`, but a hit still costs a copy of all
+    field values, so the cache pays off for payloads with expensive validation (nested schemas, validators),
+    not for flat ones. Instances with values which can not be pickled are not cached.
+    """
+    if key is None:
+        init(instance, kwargs)
+        return
+
+    entry = cache.get(key)
+
+    if entry is _MISSING:
+        try:
+            init(instance, kwargs)
+        except ValidationError as error:
+            if _cacheable(error):
+                cache.put(key, _CachedError(error))
+
+            raise
+
+        if instance.__class__.__validate_it__frozen__:
+            cache.put(key, instance)
+            return
+
+        try:
+            state = pickle.dumps(instance.__getstate__(), pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        cache.put(key, state)
+        return
+
+    if isinstance(entry, _CachedError):
+        raise entry.create()
+
+    if isinstance(entry, bytes):
+        instance.__setstate__(pickle.loads(entry))
+    else:
+        instance.__dict__.update(entry.__dict__)
+        instance.__dict__.pop('__validate_it__serialized__', None)
+
+
+def _sizeof(value):
+    size = sys.getsizeof(value)
+
+    if is_schema(value):
+        size += sum(sys.getsizeof(item) for item in value.__dict__.values())
+
+    return size
+
+
+def payload_cache_stats(cls):
+    """
+    Counters of `@schema(payload_cache=...)` cache: hits, misses, hit rate, entries and approximate
+    memory in bytes (keys and first level of cached values).
+    """
+    cache = cls.__dict__.get("__validate_it__payload_cache__")
+
+    if cache is None:
+        return {}
+
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+
+    with cache._lock:
+        entries = list(cache._data.items())
+
+    stats["hit rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["memory"] = sum(sys.getsizeof(key) + _sizeof(entry) for key, entry in entries)
+
+    return stats
+
+
+def _replace_init(cls, strip_unknown=False, collect_errors=False):
+    limits = cls.__dict__.get("__validate_it__limits__")
+
+    def _init(self, kwargs):
+        collector = getattr(_state, "collector", None)
+
+        if collect_errors or collector is not None:
+            _init_collecting(cls, self, kwargs, strip_unknown, collector)
+            return
+
+        mapped, unknown_fields = _map(cls, kwargs)
+        _strip_unknown(cls, unknown_fields, strip_unknown=strip_unknown)
+
+        self.__validate_it__origin_data__ = mapped
+
+        for key, options in self.__validate_it__options__.items():
+            value = mapped.get(key)
+            setattr(self, key, value)
+
+        _run_validators(self, cls.__validate_it__validators__)
+
+        if hasattr(cls, '__validate_it__post_init__'):
+            self.__validate_it__post_init__()
+
+    def _run(self, kwargs):
+        if limits is not None:
+            _init_limited(cls, self, kwargs, limits, _init)
+        else:
+            _init(self, kwargs)
+
+    payload_cache = cls.__dict__.get("__validate_it__payload_cache__")
+
+    def __init__(self, **kwargs) -> None:
+        """
+        Replaces original __init__ and checks keys compatibility.
+        If schema key or schema key alias does not match with data key raises ValidationError.
+
+        Example:
+
+        @schema
+        class User:
+            username: str = Options(alias='email')
+
+        Valid:
+
+        User({'name': 'John'})
+        User({'email': 'john@test.com'})
+
+        Error:
+
+        User({'lastname': 'Smith'})
+
+        With `@schema(errors="collect")` all fields and nested elements are validated and
+        `ValidationErrors` with paths of all found errors is raised.
+
+        With `@schema(max_items=..., max_depth=..., max_total_nodes=..., time_budget=...)` raw input
+        is scanned first and `LimitExceeded` is raised before any field is validated.
+
+        With `@schema(payload_cache=...)` already seen input is not validated again.
+        """
+        if payload_cache is not None and getattr(_state, "collector", None) is None:
+            _init_cached(self, kwargs, payload_cache, _payload_key(kwargs), _run)
+        else:
+            _run(self, kwargs)
+
+    cls.__init__ = __init__
+    cls.__validate_it__init__ = _run
+
+
+def _replace_setattr(cls):
+    origin = cls.__setattr__
+    profiles = getattr(cls, "__validate_it__profiles__", None)
+    forward_refs = bool(cls.__dict__.get("__validate_it__forward_refs__"))
+    frozen = cls.__dict__.get("__validate_it__frozen__", False)
+
+    def __setattr__(self, key, value):
+        """
+        Replaces original __setattr__ and checks all selected `Options`.
+
+        Example:
+
+        @schema
+        class User:
+            name: str = Options(min_length=5)
+
+        Valid:
+
+        User(name='Johan')
+
+        Invalid:
+
+        User(name='John')
+        """
+        nonlocal forward_refs
+
+        if frozen and key in self.__dict__:
+            raise FrozenInstanceError(f"cannot assign to field '{key}' of frozen {self.__class__}")
+
+        if forward_refs:
+            _resolve_types(cls)
+            forward_refs = bool(cls.__validate_it__forward_refs__)
+
+        if key in cls.__validate_it__ignore_fields__:
+            origin(self, key, value)
+            return
+
+        value = _prepare(
+            self.__class__.__name__, self.__validate_it__options__[key], key, value,
+            self.__validate_it__origin_data__, profiles.get(key) if profiles else None
+        )
+
+        if frozen:
+            value = _freeze(value)
+
+        dependents = self.__validate_it__dependents__.get(key)
+
+        if dependents and key in self.__dict__ and self.__class__.__setattr__ is __setattr__:
+            previous = {key: self.__dict__[key]}
+            origin(self, key, value)
+            _run_validators(self, dependents, previous)
+        else:
+            origin(self, key, value)
+
+        _changed(self, (key,))
+
+    cls.__setattr__ = __setattr__
+
+
+def _prepare(name, options, key, value, root, profile=None):
+    """ Packs and validates `value` of field `key`, returns value to be stored """
+    if isinstance(value, _Failed):
+        _state.collector.errors.extend(value.errors)
+        raise _Reported()
+
+    if options.__limits__ is not None:
+        _check_limits(name, key, (value,), *options.__limits__)
+
+    auto_pack = options.auto_pack
+
+    if callable(auto_pack):
+        auto_pack = auto_pack()
+
+    if auto_pack:
+        pack_function = options.packer
+
+        if options.discriminator is not None:
+            value = pack_function(value, options.get_type(), discriminator=options.discriminator)
+        else:
+            value = pack_function(value, options.get_type())
+
+    value = validate(name, options, key, value, root, profile)
+
+    if options.validated_container and value is not None:
+        value = _validated_container(name, options, key, value)
+
+    return value
+
+
+def _map_changes(cls, changes):
+    """ Maps keys and aliases of partial `changes`, key wins over alias like in `_map` """
+    options = cls.__validate_it__options__
+    aliases = {}
+
+    if hasattr(cls, "__validate_it__enable_alias_mapping__"):
+        aliases = {value.alias: key for key, value in options.items() if value.alias}
+
+    mapped = {}
+    unknown = {}
+
+    for key, value in changes.items():
+        if key in options:
+            mapped[key] = value
+        elif key in aliases:
+            mapped.setdefault(aliases[key], value)
+        else:
+            unknown[key] = value
+
+    return mapped, unknown
+
+
+def _update(instance, changes):
+    cls = instance.__class__
+
+    if getattr(cls, "__validate_it__forward_refs__", None):
+        _resolve_types(cls)
+
+    mapped, unknown = _map_changes(cls, changes)
+    _strip_unknown(cls, unknown, strip_unknown=cls.__validate_it__strip_unknown__)
+
+    origin_data = instance.__validate_it__origin_data__
+    root = {**origin_data, **mapped} if origin_data is not None else mapped
+    profiles = getattr(cls, "__validate_it__profiles__", None)
+    options = cls.__validate_it__options__
+
+    values = {
+        key: _prepare(cls.__name__, options[key], key, value, root, profiles.get(key) if profiles else None)
+        for key, value in mapped.items()
+    }
+
+    if cls.__validate_it__frozen__:
+        values = {key: _freeze(value) for key, value in values.items()}
+
+    previous = {key: instance.__dict__[key] for key in values if key in instance.__dict__}
+    instance.__dict__.update(values)
+
+    dependents = {
+        validator
+        for key in values
+        for validator in cls.__validate_it__dependents__.get(key, ())
+    }
+
+    if dependents:
+        _run_validators(instance, [
+            validator for validator in cls.__validate_it__validators__ if validator in dependents
+        ], previous, values)
+
+    _changed(instance, values)
+
+    if origin_data is not None:
+        origin_data.update(mapped)
+    else:
+        instance.__dict__['__validate_it__origin_data__'] = mapped
+
+
+def update(instance, **changes):
+    """
+    Validates and assigns several fields at once.
+
+    Keys and aliases are mapped once, only changed fields are validated and validators get `root`
+    with all changes applied. Nothing is assigned if any field is invalid.
+
+    Example:
+
+    update(user, name='John', email='john@test.com')
+    """
+    if getattr(instance.__class__, "__validate_it__frozen__", False):
+        raise FrozenInstanceError(f"cannot update fields of frozen {instance.__class__}")
+
+    _apply(instance, changes)
+
+    return instance
+
+
+def _apply(instance, changes):
+    limits = instance.__class__.__dict__.get("__validate_it__limits__")
+
+    if limits is not None:
+        _init_limited(instance.__class__, instance, changes, limits, _update)
+    else:
+        _update(instance, changes)
+
+
+def _shallow_copy(instance):
+    """ New instance sharing field values of `instance`, without validation """
+    cls = instance.__class__
+    data = instance.__dict__.copy()
 
-    if is_generic_alias(box_type, (dict, Dict)) and isinstance(value, dict):
-        subtype_0 = box_type.__args__[0]
-        subtype_1 = box_type.__args__[1]
+    if data.get('__validate_it__origin_data__') is not None:
+        data['__validate_it__origin_data__'] = dict(data['__validate_it__origin_data__'])
 
-        return all(
-            map(
-                lambda pair: is_compatible(pair[0], subtype_0) and is_compatible(pair[1], subtype_1),
-                value.items()
-            )
-        )
+    if data.get('__validate_it__serialized__') is not None:
+        data['__validate_it__serialized__'] = dict(data['__validate_it__serialized__'])
 
-    return False
+    result = cls.__new__(cls)
+    result.__dict__.update(data)
+    return result
 
 
-def getattr_or_default(obj, key, default=None):
-    if hasattr(obj, key):
-        return getattr(obj, key)
-    else:
-        return default
+def replace(instance, **changes):
+    """
+    Creates a copy of `instance` with `changes`.
 
+    Other field values (and nested instances) are shared with `instance` without validation,
+    only changed fields are validated like in `update`. Works for frozen schemas too.
 
-def validate(name, options: Options, key, value, root):
-    value = _set_default(options, key, value)
-    value = _convert(options, key, value)
-    value = _check_types(name, options, key, value)
+    Example:
 
-    value = _validate_allowed(name, options, key, value)
-    value = _validate_min_value(name, options, key, value)
-    value = _validate_max_value(name, options, key, value)
-    value = _validate_min_length(name, options, key, value)
-    value = _validate_max_length(name, options, key, value)
-    value = _validate_size(name, options, key, value)
-    value = _walk_validators(name, options, key, value, root)
+    done = replace(task, status='done')
+    """
+    result = _shallow_copy(instance)
+    result.__dict__.pop('__validate_it__hash__', None)
 
-    return value
+    _apply(result, changes)
 
+    return result
 
-def _set_default(options: Options, key, value):
-    if options.default is None:
-        return value
 
-    if value is None:
-        value = options.default
+def _store_trusted(instance, data):
+    """
+    Stores already validated field values without validation, containers are normalised like on assignment:
+    read-only for frozen schemas, wrapped for fields with `Options(validated_container=True)`.
+    """
+    cls = instance.__class__
 
-        if value is not None:
-            if callable(value):
-                value = value()
-    return value
+    instance.__dict__.update(data)
+    instance.__dict__['__validate_it__origin_data__'] = data
 
+    for key, options in cls.__validate_it__options__.items():
+        if key not in data:
+            continue
 
-def _convert(options: Options, key, value):
-    if options.parser and not is_compatible(value, options.get_type()):
-        converted = options.parser(value)
+        if cls.__validate_it__frozen__:
+            instance.__dict__[key] = _freeze(data[key])
+        elif options.validated_container and data[key] is not None:
+            instance.__dict__[key] = _validated_container(cls.__name__, options, key, data[key])
 
-        if converted is not None:
-            value = converted
 
-    return value
+def _trusted(cls, data):
+    """ Creates instance from already validated `data` without calling `__init__` """
+    instance = cls.__new__(cls)
+    _store_trusted(instance, data)
+    return instance
 
 
-def _check_types(name, options: Options, key, value):
-    if not is_compatible(value, options.get_type()):
-        raise ValidationError(
-            f"Field `{name}#{key}`: {options.get_type()} is not compatible with value `{value}`:{type(value)}"
-        )
+def _restore(cls, state):
+    instance = cls.__new__(cls)
+    instance.__setstate__(state)
+    return instance
 
-    return value
 
+_clones = weakref.WeakValueDictionary()
+_restored_clones = {}
 
-def _validate_allowed(name, options: Options, key, value):
-    if options.allowed is None:
-        return value
 
-    allowed = options.allowed
+def _restore_clone(args, state):
+    """
+    Classes created by `clone()` in this process are found by id while they are alive, classes of other
+    processes are recreated once and kept.
+    """
+    cls, strip_unknown, drop, add, clone_id = args
+    new_cls = _clones.get(clone_id) or _restored_clones.get(clone_id)
 
-    if callable(options.allowed):
-        allowed = options.allowed()
+    if new_cls is None:
+        new_cls = _restored_clones[clone_id] = clone(cls, strip_unknown=strip_unknown, exclude=drop, add=list(add))
 
-    if allowed and value not in allowed:
-        raise ValidationError(
-            f"Field `{name}#{key}`: value `{value}` is not allowed. Allowed vs: `{allowed}`"
-        )
+    return _restore(new_cls, state)
 
-    return value
 
+def _replace_pickle(cls):
+    def __getstate__(self):
+        """
+        Field values in `__validate_it__options__` order. `__validate_it__origin_data__` is not stored.
+        """
+        return tuple(
+            getattr(self, key, None)
+            for key in self.__validate_it__options__
+        )
 
-def _validate_min_length(name, options: Options, key, value):
-    if options.min_length is None:
-        return value
+    def __setstate__(self, state):
+        """
+        Restores field values without validation: the values were validated before pickling.
+        """
+        _store_trusted(self, dict(zip(self.__validate_it__options__, state)))
 
-    min_length = options.min_length
+    def __copy__(self):
+        """
+        Shallow copy without validation.
+        """
+        return _shallow_copy(self)
 
-    if callable(min_length):
-        min_length = min_length()
+    def __deepcopy__(self, memo):
+        """
+        Deep copy of field values without validation.
+        """
+        instance = self.__class__.__new__(self.__class__)
+        memo[id(self)] = instance
+        instance.__setstate__(deepcopy(self.__getstate__(), memo))
+        return instance
 
-    if min_length is not None and len(value) < min_length:
-        raise ValidationError(f"Field `{name}#{key}`: len(`{value}`) is less than required")
+    def __reduce__(self):
+        """
+        Classes created by `clone()` can not be imported by name, so they are pickled as a recipe
+        and recreated (once per process) on load.
+        """
+        clone_args = self.__class__.__dict__.get('__validate_it__clone_args__')
 
-    return value
+        if clone_args is not None:
+            return _restore_clone, (clone_args, self.__getstate__())
 
+        return _restore, (self.__class__, self.__getstate__())
 
-def _validate_max_length(name, options: Options, key, value):
-    if options.max_length is None:
-        return value
+    for name, method in (
+        ('__getstate__', __getstate__),
+        ('__setstate__', __setstate__),
+        ('__copy__', __copy__),
+        ('__deepcopy__', __deepcopy__),
+        ('__reduce__', __reduce__),
+    ):
+        if name not in cls.__dict__:
+            setattr(cls, name, method)
+
+
+def _schema_key(value):
+    """ Not frozen schema instance as `(class, field values)` pair """
+    return value.__class__, tuple(getattr(value, key, None) for key in value.__validate_it__options__)
+
+
+def _hashable(value):
+    """
+    Hashable structural equivalent of field value: lists, dicts and not frozen schemas are converted.
+    Nested levels are processed with explicit stack instead of recursion.
+    """
+    result = [value]
+    stack = [(value, result, 0)]
+
+    while stack:
+        task = stack.pop()
+
+        if task[0] is _FINISH:
+            _, convert, items, target, slot = task
+            target[slot] = convert(items)
+            continue
+
+        value, target, slot = task
+
+        if isinstance(value, (list, tuple)):
+            items, convert = list(value), tuple
+        elif isinstance(value, dict):
+            items, convert = list(value.items()), frozenset
+        elif isinstance(value, set):
+            target[slot] = frozenset(value)
+            continue
+        elif is_schema(value) and not getattr(value, "__validate_it__frozen__", False):
+            items, convert = list(_schema_key(value)), tuple
+        else:
+            continue
 
-    max_length = options.max_length
+        stack.append((_FINISH, convert, items, target, slot))
+        stack.extend((item, items, index) for index, item in enumerate(items))
 
-    if callable(max_length):
-        max_length = max_length()
+    return result[0]
 
-    if max_length is not None and len(value) > max_length:
-        raise ValidationError(f"Field `{name}#{key}`: len(`{value}`) is greater than required")
 
-    return value
+def _hash_nested(instance):
+    """
+    Computes missing hashes of frozen instances nested in fields of `instance`, deepest first, so hashing
+    of deep trees does not recurse level by level.
+    """
+    pending = []
+    seen = set()
+    stack = [getattr(instance, key, None) for key in instance.__validate_it__options__]
 
+    while stack:
+        value = stack.pop()
 
-def _validate_min_value(name, options: Options, key, value):
-    if options.min_value is None:
-        return value
+        if isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif is_schema(value) and id(value) not in seen:
+            seen.add(id(value))
 
-    min_value = options.min_value
+            if getattr(value, "__validate_it__frozen__", False):
+                if '__validate_it__hash__' in value.__dict__:
+                    continue
 
-    if callable(min_value):
-        min_value = min_value()
+                pending.append(value)
 
-    if min_value is not None and value < min_value:
-        raise ValidationError(f"Field `{name}#{key}`: value `{value}` is less than required")
+            stack.extend(getattr(value, key, None) for key in value.__validate_it__options__)
 
-    return value
+    for value in reversed(pending):
+        hash(value)
 
 
-def _validate_max_value(name, options: Options, key, value):
-    if options.max_value is None:
-        return value
+def _frozen_equal(a, b):
+    """ Structural equality of frozen instances of the same class, compared with explicit stack """
+    stack = [(a, b)]
 
-    max_value = options.max_value
+    while stack:
+        a, b = stack.pop()
 
-    if callable(max_value):
-        max_value = max_value()
+        if a is b:
+            continue
 
-    if max_value is not None and value > max_value:
-        raise ValidationError(f"Field `{name}#{key}`: value `{value}` is greater than required")
+        if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)) and isinstance(a, list) == isinstance(b, list):
+            if len(a) != len(b):
+                return False
 
-    return value
+            stack.extend(zip(a, b))
+        elif isinstance(a, dict) and isinstance(b, dict):
+            if a.keys() != b.keys():
+                return False
 
+            stack.extend((item, b[key]) for key, item in a.items())
+        elif a.__class__ is b.__class__ and getattr(a, "__validate_it__frozen__", False):
+            _hash = a.__dict__.get('__validate_it__hash__')
+            other_hash = b.__dict__.get('__validate_it__hash__')
 
-def _validate_size(name, options: Options, key, value):
-    if options.size is None:
-        return value
+            if _hash is not None and other_hash is not None and _hash != other_hash:
+                return False
 
-    size = options.size
+            stack.extend(
+                (getattr(a, key, None), getattr(b, key, None))
+                for key in a.__validate_it__options__
+            )
+        elif a != b:
+            return False
 
-    if callable(size):
-        size = size()
+    return True
 
-    if size is not None and size != len(value):
-        raise ValidationError(f"Field `{name}#{key}`: len(`{value}`) is not equal `{size}`")
 
-    return value
+def _replace_frozen(cls):
+    def __hash__(self):
+        """
+        Structural hash of field values, computed on first call and stored in `__validate_it__hash__`.
+        """
+        try:
+            return self.__dict__['__validate_it__hash__']
+        except KeyError:
+            pass
 
+        _hash_nested(self)
+
+        value = self.__dict__['__validate_it__hash__'] = hash(
+            (self.__class__, tuple(_hashable(getattr(self, key, None)) for key in self.__validate_it__options__))
+        )
 
-def _walk_validators(name, options: Options, key, value, root):
-    if options.validators is None:
         return value
 
-    validators = options.validators
+    def __eq__(self, other):
+        """
+        Compares field values, instances with different already computed hashes are not equal.
+        """
+        if self is other:
+            return True
 
-    if validators:
-        for validator in validators:
-            value = validator(name, key, value, root)
+        if other.__class__ is not self.__class__:
+            return NotImplemented
 
-    return value
+        return _frozen_equal(self, other)
 
+    def __delattr__(self, key):
+        raise FrozenInstanceError(f"cannot delete field '{key}' of frozen {self.__class__}")
 
-def _replace_init(cls, strip_unknown=False):
-    def __init__(self, **kwargs) -> None:
-        """
-        Replaces original __init__ and checks keys compatibility.
-        If schema key or schema key alias does not match with data key raises ValidationError.
+    for name, method in (
+        ('__hash__', __hash__),
+        ('__eq__', __eq__),
+        ('__delattr__', __delattr__),
+    ):
+        if cls.__dict__.get(name) is None:
+            setattr(cls, name, method)
 
-        Example:
 
-        @schema
-        class User:
-            username: str = Options(alias='email')
+def _equal(a, b):
+    """ Deep equality of field values, short-circuits on identical objects """
+    if a is b:
+        return True
 
-        Valid:
+    if a.__class__ is not b.__class__:
+        return False
 
-        User({'name': 'John'})
-        User({'email': 'john@test.com'})
+    if is_schema(a) and not getattr(a, "__validate_it__frozen__", False):
+        return not diff(a, b)
 
-        Error:
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
 
-        User({'lastname': 'Smith'})
-        """
-        mapped, unknown_fields = _map(cls, kwargs)
-        _strip_unknown(cls, unknown_fields, strip_unknown=strip_unknown)
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_equal(item, b[key]) for key, item in a.items())
 
-        self.__validate_it__origin_data__ = mapped
+    return a == b
 
-        for key, options in self.__validate_it__options__.items():
-            value = mapped.get(key)
-            setattr(self, key, value)
 
-        if hasattr(cls, '__validate_it__post_init__'):
-            self.__validate_it__post_init__()
+def diff(a, b) -> dict:
+    """
+    Delta between two instances of the same schema: outgoing (`rename`) names of changed fields
+    with outgoing values of `b`. Changed nested instances of a schema field type are described
+    by their own delta, other changed values (lists, dicts) are sent whole, `None` is sent explicitly.
 
-    cls.__init__ = __init__
+    Example:
 
+    delta = diff(old, new)  # {'status': 'done', 'owner': {'name': 'Alan'}}
+    new = apply_delta(old, delta)
+    """
+    if a.__class__ is not b.__class__:
+        raise TypeError(f"Cannot diff {a.__class__} and {b.__class__}")
 
-def _replace_setattr(cls):
-    origin = cls.__setattr__
+    delta = {}
 
-    def __setattr__(self, key, value):
-        """
-        Replaces original __setattr__ and checks all selected `Options`.
+    for key, options in a.__validate_it__options__.items():
+        if not options.required:
+            continue
 
-        Example:
+        value_a = getattr(a, key, None)
+        value_b = getattr(b, key, None)
 
-        @schema
-        class User:
-            name: str = Options(min_length=5)
+        if value_a is value_b:
+            continue
 
-        Valid:
+        box_type = options.get_type()
 
-        User(name='Johan')
+        if is_schema(box_type) and value_a.__class__ is box_type and value_b.__class__ is box_type:
+            nested = diff(value_a, value_b)
 
-        Invalid:
+            if nested:
+                delta[_expected_name(a, key)] = nested
 
-        User(name='John')
-        """
-        if key in cls.__validate_it__ignore_fields__:
-            origin(self, key, value)
-            return
+        elif not _equal(value_a, value_b):
+            delta[_expected_name(a, key)] = _serialize(options, value_b) if value_b is not None else None
 
-        options = self.__validate_it__options__[key]
+    return delta
 
-        auto_pack = options.auto_pack
 
-        if callable(auto_pack):
-            auto_pack = auto_pack()
+def apply_delta(instance, delta: dict):
+    """
+    New instance with `delta` of `diff` applied. Only touched fields and nested instances are validated,
+    other values are shared with `instance` like in `replace`.
+    """
+    options = instance.__validate_it__options__
+    keys = {_expected_name(instance, key): key for key in options}
+    changes = {}
 
-        if auto_pack:
-            pack_function = options.packer
-            value = pack_function(value, options.get_type())
+    for name, value in delta.items():
+        key = keys.get(name, name)
 
-        value = validate(self.__class__.__name__, options, key, value, self.__validate_it__origin_data__)
+        if isinstance(value, dict) and key in options:
+            box_type = options[key].get_type()
+            current = getattr(instance, key, None)
 
-        origin(self, key, value)
+            if is_schema(box_type) and current.__class__ is box_type:
+                value = apply_delta(current, value)
 
-    cls.__setattr__ = __setattr__
+        changes[key] = value
+
+    return replace(instance, **changes)
 
 
 def _map(cls, data):
@@ -569,11 +3110,51 @@ def _set_options(cls):
         setattr(cls, "__validate_it__enable_alias_mapping__", True)
 
 
+def _has_forward_ref(_type):
+    if isinstance(_type, (str, ForwardRef)):
+        return True
+
+    return any(map(_has_forward_ref, getattr(_type, '__args__', None) or ()))
+
+
+def _resolve_types(cls):
+    """ Replaces string annotations (e.g. `children: List["Node"]`) by types once they can be evaluated """
+    unresolved = cls.__dict__.get("__validate_it__forward_refs__")
+
+    if not unresolved:
+        return
+
+    try:
+        hints = get_type_hints(cls)
+    except NameError:
+        return
+
+    profiles = cls.__dict__.get("__validate_it__profiles__")
+
+    for key in unresolved:
+        cls.__validate_it__options__[key].set_type(hints[key])
+
+        if profiles and key in profiles:
+            profiles[key].box_type = hints[key]
+            profiles[key]._reset()
+
+    cls.__validate_it__forward_refs__ = ()
+
+    if cls.__dict__.get("__validate_it__payload_cache__") is not None:
+        _check_static_options(cls)
+
+
 def _set_options_type(cls):
     if hasattr(cls, '__annotations__'):
         for key, _type in cls.__annotations__.items():
             cls.__validate_it__options__[key].set_type(_type)
 
+        cls.__validate_it__forward_refs__ = tuple(
+            key
+            for key, _type in cls.__annotations__.items()
+            if _has_forward_ref(_type)
+        )
+
 
 def _set_options_required(cls):
     if hasattr(cls, '__annotations__'):
@@ -600,17 +3181,124 @@ def _setup_validate_it(cls):
         cls.__validate_it__origin_data__ = None
 
 
-def _init_schema(cls, strip_unknown=False):
+def _set_profiles(cls, adaptive):
+    warmup = 1000 if adaptive is True else int(adaptive)
+
+    cls.__validate_it__profiles__ = {
+        key: _TypeProfile(options.get_type(), warmup)
+        for key, options in cls.__validate_it__options__.items()
+    }
+
+
+def _set_validators(cls, validators):
+    """
+    Schema validators are `function` or `(function, depends_on)` tuples, validators of base schemas
+    are inherited. `__validate_it__dependents__` maps field key to validators re-run after its assignment.
+    """
+    result = list(getattr(cls, "__validate_it__validators__", ()))
+
+    for validator in validators or ():
+        function, depends_on = validator if isinstance(validator, tuple) else (validator, None)
+
+        if depends_on is not None:
+            depends_on = frozenset(depends_on)
+            unknown = depends_on - cls.__validate_it__options__.keys()
+
+            if unknown:
+                raise ValueError(f"{cls}: validator {function} depends on unknown fields {unknown}")
+
+        result.append((function, depends_on))
+
+    cls.__validate_it__validators__ = tuple(result)
+    cls.__validate_it__dependents__ = {
+        key: tuple(
+            validator
+            for validator in result
+            if validator[1] is None or key in validator[1]
+        )
+        for key in cls.__validate_it__options__
+    }
+
+
+_DYNAMIC_OPTIONS = (
+    "auto_pack", "allowed", "min_value", "max_value", "size", "min_length", "max_length", "sample",
+    "max_items", "max_depth", "max_total_nodes",
+)
+
+
+def _check_static_options(cls):
+    """
+    Cache of validated input is safe only if constraints are static in the whole graph of field types:
+    fields of `cls`, union arms, container items and nested schemas. Callable `default` is allowed only
+    if it is a class (e.g. `list`): its value does not depend on the call.
+    """
+    for box_type in _schema_graph(cls):
+        for key, options in box_type.__validate_it__options__.items():
+            dynamic = [name for name in _DYNAMIC_OPTIONS if callable(getattr(options, name))]
+
+            if callable(options.default) and not isinstance(options.default, type):
+                dynamic.append("default")
+
+            if dynamic:
+                raise ValueError(
+                    f"{cls}: payload cache requires static options, `{box_type.__name__}.{key}.{dynamic[0]}` is callable"
+                )
+
+
+def _set_payload_cache(cls, payload_cache):
+    if payload_cache:
+        _check_static_options(cls)
+
+    cls.__validate_it__payload_cache__ = _LRU(payload_cache) if payload_cache else None
+
+
+def _set_limits(cls, max_items, max_depth, max_total_nodes, time_budget):
+    if max_items is None and max_depth is None and max_total_nodes is None and time_budget is None:
+        cls.__validate_it__limits__ = None
+    else:
+        cls.__validate_it__limits__ = (max_items, max_depth, max_total_nodes, time_budget)
+
+
+def _init_schema(
+    cls, strip_unknown=False, adaptive=None, errors="raise",
+    max_items=None, max_depth=None, max_total_nodes=None, time_budget=None, track_changes=False,
+    frozen=False, validators=None, intern=None, payload_cache=None
+):
+    if errors not in ("raise", "collect"):
+        raise ValueError(f"{cls}: unknown errors mode `{errors}`")
+
     _setup_validate_it(cls)
 
+    cls.__validate_it__strip_unknown__ = strip_unknown
+    cls.__validate_it__track_changes__ = track_changes
+    cls.__validate_it__frozen__ = frozen
+
     _set_options(cls)
     _set_options_type(cls)
     _set_options_required(cls)
     _set_options_type_any(cls)
 
+    if intern and not frozen:
+        raise ValueError(f"{cls}: only frozen schemas can be interned")
+
+    cls.__validate_it__intern__ = intern
+    cls.__validate_it__interned__ = _LRU(intern) if intern and intern is not True else None
+
+    _set_payload_cache(cls, payload_cache)
+
+    if adaptive:
+        _set_profiles(cls, adaptive)
+
+    _set_limits(cls, max_items, max_depth, max_total_nodes, time_budget)
+    _set_validators(cls, validators)
+
     if not hasattr(cls, '__validate_it__init_replaced__'):
-        _replace_init(cls, strip_unknown)
+        _replace_init(cls, strip_unknown, collect_errors=errors == "collect")
         _replace_setattr(cls)
+        _replace_pickle(cls)
+
+        if frozen:
+            _replace_frozen(cls)
 
 
 def _expected_name(instance, name):
@@ -623,22 +3311,145 @@ def _expected_name(instance, name):
     return name
 
 
-def to_dict(instance) -> dict:
-    _data = {}
+def _paths_tree(paths):
+    """ Dotted paths -> nested dict, `True` marks the whole subtree: ['a.b', 'c'] -> {'a': {'b': True}, 'c': True} """
+    tree = {}
+
+    for path in paths:
+        node = tree
+        *parents, last = path.split(".")
+
+        for name in parents:
+            child = node.get(name)
+
+            if child is True:
+                break
+
+            node = node.setdefault(name, {})
+        else:
+            node[last] = True
+
+    return tree
+
+
+def _project(value, include, exclude):
+    """ Outgoing value of nested instances (also in lists and dict values) limited by projection trees """
+    if isinstance(value, list):
+        return [_project(item, include, exclude) for item in value]
+
+    if isinstance(value, dict):
+        return {key: _project(item, include, exclude) for key, item in value.items()}
+
+    if not is_schema(value):
+        return value
+
+    out = {}
+
+    for key, options in value.__validate_it__options__.items():
+        if not options.required or not hasattr(value, key):
+            continue
+
+        if include is not None:
+            if key not in include:
+                continue
+
+            subtree, exclude_subtree = include[key], None
+        else:
+            subtree, exclude_subtree = None, exclude.get(key)
+
+            if exclude_subtree is True:
+                continue
+
+        field = getattr(value, key)
+
+        if subtree is True or (subtree is None and exclude_subtree is None):
+            field = _serialize(options, field)
+        elif field is not None:
+            field = _project(field, subtree, exclude_subtree)
+
+            if options.serializer:
+                field = options.serializer(field)
+
+        if field is not None:
+            out[_expected_name(value, key)] = field
+
+    return out
+
+
+def to_dict(instance, max_depth=None, include=None, exclude=None) -> dict:
+    """
+    Outgoing dict of instance. `include` or `exclude` dotted paths of field keys (`'owner.name'`)
+    select serialized fields, excluded subtrees are not visited at all. Paths go through nested
+    instances, lists and dict values of them.
+    """
+    if include is None and exclude is None:
+        return _unpack(instance, instance.__class__, max_depth)
+
+    if include is not None and exclude is not None:
+        raise ValueError(f"{instance.__class__}: Cannot specify both exclude and include")
+
+    return _project(
+        instance,
+        _paths_tree(include) if include is not None else None,
+        _paths_tree(exclude) if exclude is not None else None
+    )
 
-    for key, options in instance.__validate_it__options__.items():
-        if options.required and hasattr(instance, key):
-            value = getattr(instance, key)
 
-            _value = unpack_value(value, options.get_type())
+def load(cls, data: dict, fields=None, message_id=None):
+    """
+    Creates instance of `cls` from `data` validating and packing only `fields`, other fields are
+    set to `None` without validation. Schema `validators` and `__validate_it__post_init__` are not called
+    for partial instances.
 
-            if _value is not None:
-                if options.serializer:
-                    _value = options.serializer(_value)
+    With `@schema(payload_cache=...)` `message_id` is used as cache key instead of digest of `data`.
 
-                _data[_expected_name(instance, key)] = _value
+    Example:
 
-    return _data
+    user = load(User, payload, fields=['id', 'name'])
+    """
+    if message_id is not None:
+        cache = cls.__dict__.get("__validate_it__payload_cache__")
+
+        if cache is None:
+            raise ValueError(f"{cls}: `message_id` requires @schema(payload_cache=...)")
+
+        if fields is not None:
+            raise ValueError(f"{cls}: `message_id` can not be used with `fields`")
+
+        instance = cls.__new__(cls)
+        _init_cached(instance, dict(data), cache, ("message_id", message_id), cls.__validate_it__init__)
+        return instance
+
+    if fields is None:
+        return cls(**data)
+
+    fields = set(fields)
+    unknown = fields - cls.__validate_it__options__.keys()
+
+    if unknown:
+        raise ValueError(f"{cls}: unknown fields {unknown}")
+
+    def _init(instance, data):
+        mapped, unknown_fields = _map(cls, data)
+        _strip_unknown(cls, unknown_fields, strip_unknown=cls.__validate_it__strip_unknown__)
+
+        instance.__dict__['__validate_it__origin_data__'] = mapped
+
+        for key in cls.__validate_it__options__:
+            if key in fields:
+                setattr(instance, key, mapped.get(key))
+            else:
+                instance.__dict__[key] = None
+
+    instance = cls.__new__(cls)
+    limits = cls.__dict__.get("__validate_it__limits__")
+
+    if limits is not None:
+        _init_limited(cls, instance, dict(data), limits, _init)
+    else:
+        _init(instance, dict(data))
+
+    return instance
 
 
 def clone(cls, strip_unknown=False, exclude=None, include=None, add: List[Tuple[str, Type, Options]] = None):
@@ -655,7 +3466,7 @@ def clone(cls, strip_unknown=False, exclude=None, include=None, add: List[Tuple[
         raise TypeError(f"Cloned class {cls} must be schema")
 
     for key, value in cls.__dict__.items():
-        if key not in ["__validate_it__options__"] + list(cls.__validate_it__options__.keys()):
+        if key not in ["__validate_it__options__", "__dict__", "__weakref__"] + list(cls.__validate_it__options__.keys()):
             _dict[key] = value
 
     if include:
@@ -676,10 +3487,15 @@ def clone(cls, strip_unknown=False, exclude=None, include=None, add: List[Tuple[
             options.set_type(_type)
             _dict["__validate_it__options__"][key] = options
 
+    clone_id = uuid.uuid4().hex
+    _dict["__validate_it__clone_args__"] = (cls, strip_unknown, tuple(sorted(_drop)), tuple(add or ()), clone_id)
+
     new_cls = type(
-        f"DynamicCloneOf{cls.__name__}_{uuid.uuid4().hex}", cls.__bases__, _dict
+        f"DynamicCloneOf{cls.__name__}_{clone_id}", cls.__bases__, _dict
     )
 
+    _clones[clone_id] = new_cls
+
     return new_cls
 
 
@@ -687,5 +3503,19 @@ __all__ = [
     "to_dict",
     "representation",
     "clone",
-    "pack_value"
+    "pack_value",
+    "adaptive_stats",
+    "update",
+    "replace",
+    "diff",
+    "apply_delta",
+    "load",
+    "pure",
+    "batch",
+    "payload_cache_stats",
+    "json_schema",
+    "ValidatedList",
+    "ValidatedDict",
+    "FrozenList",
+    "FrozenDict",
 ]